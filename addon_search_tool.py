@@ -7,11 +7,1834 @@ import threading
 from datetime import datetime
 import os
 import re
+import io
+import argparse
+import cProfile
+import pstats
+import glob
+import sys
+import time
+import tomllib
+import hashlib
+import queue
+import shutil
+import zipfile
+import csv
+import platform
+import unicodedata
+import mmap
+import struct
+import bisect
+import multiprocessing
+from array import array
+import html
+import ast
+from html.parser import HTMLParser
 from pathlib import Path
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlparse, parse_qs, urlencode
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED, as_completed
 
-class BlenderStyleSearchTool:
+# アドオン探索の既定設定
+DEFAULT_SCAN_MAX_DEPTH = 2
+DEFAULT_EXCLUDE_PATTERNS = [
+    '.git/', '.svn/', '.hg/', '__pycache__/', 'node_modules/',
+    '.venv/', 'venv/', '.idea/', '.vscode/', '.addon_trash/', '*.partial/',
+    '*.deleting/',
+]
+
+class ExcludeMatcher:
+    """gitignore風の除外パターン照合
+
+    対応書式: '#'コメント, '!'否定, 末尾'/'でフォルダのみ, '/'を含むパターンは
+    ルートからの相対パスに、含まないパターンは名前に対して照合, '*' '?' '**'
+    """
+    def __init__(self, patterns):
+        self.rules = []
+        for raw in patterns or []:
+            pattern = raw.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            negate = pattern.startswith('!')
+            if negate:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith('/')
+            pattern = pattern.rstrip('/')
+            anchored = '/' in pattern
+            pattern = pattern.lstrip('/')
+            if not pattern:
+                continue
+            regex = re.compile(self._translate(pattern))
+            self.rules.append((regex, negate, dir_only, anchored))
+        
+        # 否定ルールが無い場合は1本の正規表現にまとめて高速化
+        self._fast = None
+        if not any(rule[1] for rule in self.rules):
+            def combine(selected):
+                parts = [rule[0].pattern for rule in selected]
+                return re.compile('|'.join(f'(?:{p})' for p in parts)) if parts else None
+            self._fast = (
+                combine([r for r in self.rules if not r[3] and not r[2]]),
+                combine([r for r in self.rules if not r[3] and r[2]]),
+                combine([r for r in self.rules if r[3] and not r[2]]),
+                combine([r for r in self.rules if r[3] and r[2]]),
+            )
+    
+    @staticmethod
+    def _translate(pattern):
+        """globパターンを正規表現に変換"""
+        out = []
+        i = 0
+        while i < len(pattern):
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+            elif pattern.startswith('**', i):
+                out.append('.*')
+                i += 2
+            elif pattern[i] == '*':
+                out.append('[^/]*')
+                i += 1
+            elif pattern[i] == '?':
+                out.append('[^/]')
+                i += 1
+            else:
+                out.append(re.escape(pattern[i]))
+                i += 1
+        return ''.join(out) + r'\Z'
+    
+    def is_excluded(self, rel_path, name, is_dir):
+        """除外対象かどうか（rel_pathはルートからの'/'区切り相対パス）"""
+        if self._fast is not None:
+            name_any, name_dir, path_any, path_dir = self._fast
+            if name_any and name_any.match(name):
+                return True
+            if path_any and path_any.match(rel_path):
+                return True
+            if is_dir:
+                if name_dir and name_dir.match(name):
+                    return True
+                if path_dir and path_dir.match(rel_path):
+                    return True
+            return False
+        
+        # 否定ルールがある場合は最後に一致したルールを優先
+        excluded = False
+        for regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                excluded = not negate
+        return excluded
+
+def walk_addon_candidates(root, max_depth=DEFAULT_SCAN_MAX_DEPTH, matcher=None):
+    """os.scandirでアドオン候補を探索
+
+    (アドオンのパス, 'file'|'folder', 深さ, 情報ファイルのパス, そのstat) を返すジェネレータ。
+    フォルダ型アドオン（blender_manifest.toml か __init__.py を持つフォルダ）の中には降りない。
+    単体.pyファイルはルート直下のみアドオンとして扱う。
+    """
+    root = os.path.abspath(root)
+    # 訪問済みのパス（シンボリックリンクのループ防止、リンク先は実パスで記録）
+    visited = {os.path.normcase(root), os.path.normcase(os.path.realpath(root))}
+    # (パス, ルートからの相対パス, 深さ)
+    stack = [(root, '', 0)]
+    
+    while stack:
+        dir_path, rel_dir, depth = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            continue
+        
+        subdirs = []
+        with entries:
+            for entry in entries:
+                name = entry.name
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                
+                if matcher is not None and matcher.is_excluded(rel_path, name, is_dir):
+                    continue
+                
+                if not is_dir:
+                    if depth == 0 and name.endswith('.py'):
+                        try:
+                            yield entry.path, 'file', depth, entry.path, entry.stat()
+                        except OSError:
+                            pass
+                    continue
+                
+                # フォルダ型アドオン判定（stat 1回で存在確認と情報取得を兼ねる）
+                # マニフェストがあれば小さいTOMLだけを読むので優先する
+                info_stat = None
+                for info_name in (MANIFEST_FILENAME, '__init__.py'):
+                    info_path = os.path.join(entry.path, info_name)
+                    try:
+                        info_stat = os.stat(info_path)
+                        break
+                    except OSError:
+                        pass
+                if info_stat is not None:
+                    yield entry.path, 'folder', depth, info_path, info_stat
+                    continue
+                
+                if depth < max_depth:
+                    subdirs.append((entry, rel_path))
+        
+        for entry, rel_path in subdirs:
+            child = entry.path
+            if entry.is_symlink() or getattr(entry, 'is_junction', lambda: False)():
+                # リンク先は実パスで扱い、ループや二重探索を防ぐ
+                child = os.path.realpath(child)
+            key = os.path.normcase(child)
+            if key in visited:
+                continue
+            visited.add(key)
+            stack.append((child, rel_path, depth + 1))
+
+# Blender 4.2+ エクステンションのマニフェスト
+MANIFEST_FILENAME = "blender_manifest.toml"
+
+# 更新チェック設定
+GITHUB_API_BASE = "https://api.github.com"
+UPDATE_CHECK_TTL = 6 * 60 * 60  # この期間内は再問い合わせしない（秒）
+UPDATE_CHECK_WORKERS = 8
+
+# ブックマークのリンク確認設定
+LINK_CHECK_TTL = 24 * 60 * 60  # この期間内に確認したURLは再確認しない（秒）
+LINK_CHECK_WORKERS = 32
+LINK_CHECK_PER_HOST = 4  # 同じホストへの同時リクエスト数の上限
+LINK_STATUS_MARKS = {'dead': '❌ ', 'redirect': '↪ ', 'error': '⚠ '}
+
+# 検出済みアドオンルートのキャッシュ有効期間（秒）
+ROOT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Blenderが参照する環境変数（変化したらルートを再検出）
+BLENDER_ROOT_ENV_VARS = ('BLENDER_USER_SCRIPTS', 'BLENDER_USER_EXTENSIONS', 'BLENDER_SYSTEM_SCRIPTS')
+
+def tree_size_and_dir_mtime(path, with_sizes=True):
+    """フォルダ内の全ファイルサイズの合計と、フォルダ（サブフォルダ含む）の最新mtime_ns
+
+    シンボリックリンクは辿らない。with_sizes=False ならファイルはstatせずmtimeだけ求める。
+    """
+    total = 0
+    newest = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            newest = max(newest, os.stat(current, follow_symlinks=False).st_mtime_ns)
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif with_sizes:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return total, newest
+
+def compute_tree_size(path):
+    """フォルダ内の全ファイルサイズの合計（シンボリックリンクは辿らない）"""
+    return tree_size_and_dir_mtime(path)[0]
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """ファイル内容のSHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def iter_addon_files(addon_path):
+    """アドオンを構成するファイル (相対パス, 絶対パス, stat) を列挙（キャッシュ類は除外）"""
+    if os.path.isfile(addon_path):
+        yield os.path.basename(addon_path), addon_path, os.stat(addon_path)
+        return
+    stack = [(addon_path, '')]
+    while stack:
+        current, rel_dir = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != '__pycache__':
+                                stack.append((entry.path, rel_path))
+                        elif not entry.name.endswith(('.pyc', '.pyo')):
+                            yield rel_path, entry.path, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+
+# import 依存関係の解析（ast）
+# Blender同梱のPythonで使えるモジュール（bpy系のAPI + 同梱のサードパーティ）
+BLENDER_API_MODULES = frozenset((
+    'bpy', 'bpy_extras', 'bpy_types', 'bmesh', 'mathutils', 'bgl', 'blf', 'gpu', 'gpu_extras',
+    'aud', 'bl_math', 'bl_ui', 'bl_operators', 'bl_keymap_utils', 'bl_i18n_utils', 'bl_ext',
+    'idprop', 'imbuf', 'freestyle', 'rna_prop_ui', 'addon_utils', 'nodeitems_utils', 'cycles',
+))
+BLENDER_BUNDLED_PACKAGES = frozenset((
+    'numpy', 'requests', 'certifi', 'urllib3', 'idna', 'charset_normalizer', 'zstandard',
+))
+BLENDER_BUNDLED_MODULES = BLENDER_API_MODULES | BLENDER_BUNDLED_PACKAGES
+DEPENDENCY_CLASSES = ('stdlib', 'bundled', 'addons', 'missing')
+IMPORT_PARSE_INLINE_LIMIT = 32  # これより少なければプロセスプールを使わずに解析
+
+def parse_import_names(path):
+    """Pythonファイルが絶対importしているトップレベルのモジュール名（プロセスプールから呼ぶ）
+
+    戻り値: (path, 名前のリスト, エラー文字列 or None)。相対importは自分のパッケージ内なので含めない。
+    """
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError) as e:
+        return path, [], str(e)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            names.add(node.module.split('.')[0])
+    return path, sorted(names), None
+
+def addon_module_name(addon):
+    """アドオンのモジュール名（フォルダ名 / .pyのファイル名）"""
+    return os.path.splitext(os.path.basename(addon['file_path'].rstrip('/\\')))[0]
+
+def addon_internal_modules(addon):
+    """アドオン自身とその直下のモジュール名（同梱ライブラリ・自パッケージへの絶対importを除外するため）"""
+    names = {addon_module_name(addon)}
+    if addon['type'] == 'folder':
+        try:
+            with os.scandir(addon['file_path']) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        names.add(entry.name)
+                    elif entry.name.endswith('.py'):
+                        names.add(entry.name[:-3])
+        except OSError:
+            pass
+    return names
+
+# 操作キュー（削除・ゴミ箱・コピー・インストール）
+TRASH_FOLDER_NAME = ".addon_trash"
+
+try:
+    from send2trash import send2trash
+except ImportError:
+    send2trash = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+class OperationCancelled(Exception):
+    """操作がキャンセルされた"""
+
+class AddonOperation:
+    """キュー内の1操作（進捗とキャンセル状態を持つ）"""
+    def __init__(self, label, func, on_success=None, done_message=None):
+        self.label = label
+        self.func = func
+        self.on_success = on_success
+        self.done_message = done_message
+        self.status = 'pending'
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self._cancel_event = threading.Event()
+        self._notify = None
+        self._finished = False
+    
+    def cancel(self):
+        """キャンセル要求"""
+        self._cancel_event.set()
+    
+    def check_cancelled(self):
+        """キャンセル要求があれば中断"""
+        if self._cancel_event.is_set():
+            raise OperationCancelled()
+    
+    def report(self, done, total):
+        """進捗通知（done / total）"""
+        self.progress = done / total if total else 1.0
+        if self._notify:
+            self._notify(self)
+
+class OperationQueue:
+    """ファイル操作を1本のワーカースレッドで順番に実行するキュー"""
+    def __init__(self, on_update=None):
+        self.on_update = on_update
+        self._queue = queue.Queue()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(self, label, func, on_success=None, done_message=None):
+        """操作を追加（funcは AddonOperation を受け取り結果を返す）"""
+        op = AddonOperation(label, func, on_success, done_message)
+        op._notify = self.on_update
+        with self._lock:
+            self._pending.append(op)
+        self._queue.put(op)
+        return op
+    
+    def cancel_all(self):
+        """実行中・待機中の操作をすべてキャンセル"""
+        with self._lock:
+            for op in self._pending:
+                op.cancel()
+    
+    def _run(self):
+        while True:
+            op = self._queue.get()
+            try:
+                op.check_cancelled()
+                op.status = 'running'
+                op.report(0, 1)
+                op.result = op.func(op)
+                op.progress = 1.0
+                op.status = 'done'
+            except OperationCancelled:
+                op.status = 'cancelled'
+            except Exception as e:
+                op.status = 'failed'
+                op.error = e
+            finally:
+                with self._lock:
+                    if op in self._pending:
+                        self._pending.remove(op)
+            if self.on_update:
+                self.on_update(op)
+
+def _list_tree(path):
+    """フォルダ内のファイルとフォルダを列挙（フォルダは深い順）"""
+    files, dirs = [], []
+    for current, dirnames, filenames in os.walk(path):
+        dirs.append(current)
+        files.extend(os.path.join(current, name) for name in filenames)
+    return files, dirs[::-1]
+
+def delete_path(path, op=None):
+    """ファイル/フォルダを削除（ファイル単位で進捗通知）
+
+    キャンセルできるのは削除を始める前まで。フォルダは一時名に改名してから
+    中身を消すので、途中で止まっても壊れたアドオンが元の場所に残らない。
+    """
+    if op:
+        op.check_cancelled()
+    if os.path.isfile(path) or os.path.islink(path):
+        os.unlink(path)
+        return path
+    doomed = path.rstrip('/\\') + ".deleting"
+    if os.path.exists(doomed):
+        delete_path(doomed)
+    os.rename(path, doomed)
+    files, dirs = _list_tree(doomed)
+    total = len(files) + len(dirs)
+    for count, file_path in enumerate(files, 1):
+        os.unlink(file_path)
+        if op and count % 50 == 0:
+            op.report(count, total)
+    for dir_path in dirs:
+        os.rmdir(dir_path)
+    if op:
+        op.report(total, total)
+    return path
+
+def copy_path(source, destination, op=None, overwrite=False):
+    """ファイル/フォルダをコピー（一時名にコピーしてから置き換えるので中断しても壊れない）"""
+    partial = destination + ".partial"
+    if os.path.exists(partial):
+        delete_path(partial)
+    
+    if os.path.isfile(source):
+        if op:
+            op.check_cancelled()
+        shutil.copy2(source, partial)
+    else:
+        files, _ = _list_tree(source)
+        try:
+            for count, file_path in enumerate(files, 1):
+                if op:
+                    op.check_cancelled()
+                target = os.path.join(partial, os.path.relpath(file_path, source))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(file_path, target)
+                if op and count % 20 == 0:
+                    op.report(count, len(files))
+            os.makedirs(partial, exist_ok=True)
+        except BaseException:
+            delete_path(partial)
+            raise
+    
+    if os.path.exists(destination):
+        if not overwrite:
+            delete_path(partial)
+            raise FileExistsError(destination)
+        delete_path(destination)
+    os.replace(partial, destination)
+    return destination
+
+def move_to_trash(path, trash_dir, op=None):
+    """ゴミ箱へ移動（send2trashがあればOSのゴミ箱、なければアドオンフォルダ内の退避先）"""
+    if op:
+        op.check_cancelled()
+    if send2trash is not None:
+        send2trash(path)
+        return None
+    
+    os.makedirs(trash_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    destination = os.path.join(trash_dir, f"{stamp}_{os.path.basename(path)}")
+    try:
+        os.rename(path, destination)
+    except OSError:
+        # 別ドライブの場合はコピーしてから削除
+        copy_path(path, destination, op)
+        delete_path(path, op)
+    return destination
+
+# ZIPから読み込むサイズの上限（bl_infoはファイル先頭付近にある）
+ZIP_BL_INFO_LIMIT = 256 * 1024
+ZIP_MANIFEST_LIMIT = 64 * 1024
+ZIP_JUNK_PREFIXES = ('__MACOSX/',)
+
+def find_addon_in_zip(zf):
+    """ZIP内のアドオン構成を判定
+
+    戻り値: (種類, 情報メンバー, 展開対象の接頭辞, インストール名) または None
+    種類は 'manifest'（エクステンション）/ 'package'（フォルダ型）/ 'file'（単体.py）
+    """
+    names = [name for name in zf.namelist()
+             if not name.startswith(ZIP_JUNK_PREFIXES) and not name.endswith('/')]
+    archive_name = os.path.splitext(os.path.basename(zf.filename or 'addon'))[0]
+    
+    def depth(name):
+        return name.count('/')
+    
+    manifests = sorted((n for n in names if n.rsplit('/', 1)[-1] == MANIFEST_FILENAME and depth(n) <= 1), key=depth)
+    if manifests:
+        member = manifests[0]
+        prefix = member[:-len(MANIFEST_FILENAME)]
+        return 'manifest', member, prefix, prefix.rstrip('/') or archive_name
+    
+    packages = sorted((n for n in names if n.endswith('/__init__.py') and depth(n) == 1))
+    if packages:
+        member = packages[0]
+        prefix = member[:-len('__init__.py')]
+        return 'package', member, prefix, prefix.rstrip('/')
+    
+    scripts = [n for n in names if n.endswith('.py') and depth(n) == 0]
+    if len(scripts) == 1:
+        return 'file', scripts[0], scripts[0], scripts[0]
+    return None
+
+def is_safe_install_name(name):
+    """インストール名が単一のパス要素か（区切り文字や . / .. を含まない）"""
+    return (isinstance(name, str) and name not in ('', '.', '..')
+            and '/' not in name and '\\' not in name and '\0' not in name)
+
+def addon_install_destination(target_root, install_name):
+    """インストール先のパスを検証して返す（アドオンフォルダの外を指す場合はValueError）"""
+    if not is_safe_install_name(install_name):
+        raise ValueError(f"不正なインストール名です: {install_name!r}")
+    destination = os.path.join(target_root, install_name)
+    root = os.path.realpath(target_root)
+    if os.path.dirname(os.path.realpath(destination)) != root:
+        raise ValueError(f"アドオンフォルダの外へのインストールは許可されていません: {destination}")
+    return destination
+
+def read_zip_bl_info_source(zf, member):
+    """bl_infoの終わりが見つかるまで、または上限までストリーミングで読む"""
+    chunks = []
+    total = 0
+    with zf.open(member) as f:
+        while total < ZIP_BL_INFO_LIMIT:
+            chunk = f.read(16 * 1024)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            total += len(chunk)
+            text = b''.join(chunks).decode('utf-8', errors='ignore')
+            match = re.search(r'bl_info\s*=\s*{', text)
+            if match and '}' in text[match.end():]:
+                break
+    return b''.join(chunks).decode('utf-8', errors='ignore')
+
+def extract_addon_zip(zip_path, target_root, install_name, prefix, op=None):
+    """アドオン部分のメンバーだけを一時フォルダに展開してから配置"""
+    destination = addon_install_destination(target_root, install_name)
+    partial = destination + ".partial"
+    if os.path.exists(partial):
+        delete_path(partial)
+    
+    with zipfile.ZipFile(zip_path) as zf:
+        if prefix.endswith('.py'):
+            # 単体.pyファイル
+            members = [prefix]
+        else:
+            members = [info.filename for info in zf.infolist()
+                       if info.filename.startswith(prefix)
+                       and not info.filename.endswith('/')
+                       and not info.filename.startswith(ZIP_JUNK_PREFIXES)]
+        
+        try:
+            for count, member in enumerate(members, 1):
+                if op:
+                    op.check_cancelled()
+                if prefix.endswith('.py'):
+                    target = partial
+                else:
+                    relative = member[len(prefix):]
+                    target = os.path.normpath(os.path.join(partial, relative))
+                    # ZIP Slip対策（展開先の外に書き込ませない）
+                    if not target.startswith(os.path.normpath(partial) + os.sep):
+                        raise ValueError(f"不正なパスを含むZIPです: {member}")
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                with zf.open(member) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                if op and count % 20 == 0:
+                    op.report(count, len(members))
+        except BaseException:
+            if os.path.exists(partial):
+                delete_path(partial)
+            raise
+    
+    if os.path.exists(destination):
+        delete_path(destination)
+    os.replace(partial, destination)
+    return destination
+
+# インベントリのエクスポート
+EXPORT_FIELDS = [
+    'name', 'version', 'description', 'author', 'category', 'blender_version',
+    'file_size', 'modified_date', 'format', 'type', 'folder_path', 'file_path',
+    'doc_url', 'tracker_url',
+]
+EXPORT_FORMATS = ('ndjson', 'csv', 'parquet')
+PARQUET_BATCH_SIZE = 1024
+
+def export_format_from_path(path):
+    """拡張子からエクスポート形式を判定"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    if ext == '.parquet':
+        return 'parquet'
+    return 'ndjson'
+
+def addon_to_record(addon):
+    """アドオン情報を書き出し用のフラットな辞書に変換"""
+    record = {}
+    for field in EXPORT_FIELDS:
+        value = addon.get(field)
+        if field in ('version', 'blender_version') and value is not None:
+            value = ".".join(map(str, value))
+        elif field == 'modified_date' and value is not None:
+            value = datetime.fromtimestamp(value).isoformat(timespec='seconds')
+        record[field] = value
+    return record
+
+class InventoryWriter:
+    """インベントリを1件ずつ書き出すライター（NDJSON / CSV / Parquet）"""
+    def __init__(self, path, fmt='ndjson'):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"未対応の形式です: {fmt}")
+        if fmt == 'parquet' and pq is None:
+            raise RuntimeError("Parquet出力には pyarrow が必要です")
+        self.path = path
+        self.fmt = fmt
+        self.count = 0
+        self._file = None
+        self._csv = None
+        self._parquet = None
+        self._batch = []
+    
+    def __enter__(self):
+        if self.fmt == 'ndjson':
+            self._file = open(self.path, 'w', encoding='utf-8')
+        elif self.fmt == 'csv':
+            self._file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+            self._csv = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS)
+            self._csv.writeheader()
+        return self
+    
+    def write(self, addon):
+        """1件書き出し"""
+        record = addon_to_record(addon)
+        if self.fmt == 'ndjson':
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif self.fmt == 'csv':
+            self._csv.writerow(record)
+        else:
+            self._batch.append(record)
+            if len(self._batch) >= PARQUET_BATCH_SIZE:
+                self._flush_parquet()
+        self.count += 1
+    
+    def _flush_parquet(self):
+        """溜めた分をParquetの行グループとして書き出し"""
+        if not self._batch:
+            return
+        table = pa.Table.from_pylist(self._batch, schema=self._parquet_schema())
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        self._parquet.write_table(table)
+        self._batch = []
+    
+    @staticmethod
+    def _parquet_schema():
+        return pa.schema([
+            (field, pa.int64() if field == 'file_size' else pa.string())
+            for field in EXPORT_FIELDS
+        ])
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self.fmt == 'parquet':
+            if exc_type is None:
+                self._flush_parquet()
+                if self._parquet is None:
+                    # 0件でもスキーマだけのファイルを作る
+                    pq.write_table(pa.Table.from_pylist([], schema=self._parquet_schema()), self.path)
+            if self._parquet is not None:
+                self._parquet.close()
+        if self._file is not None:
+            self._file.close()
+        return False
+
+# アドオン1件分のレコード（辞書の代わりに __slots__ で省メモリ化）
+ADDON_RECORD_FIELDS = (
+    'name', 'version', 'description', 'author', 'category', 'blender_version',
+    'file_size', 'modified_date', 'format', 'doc_url', 'tracker_url',
+    'folder_path', 'file_path', 'type',
+)
+# 多くのアドオンで同じ値が繰り返されるフィールド（長さに関係なく intern して共有する）
+_INTERNED_FIELDS = frozenset(('author', 'category', 'format', 'folder_path', 'type', 'doc_url', 'tracker_url'))
+_INTERN_MAX_LENGTH = 64
+_interned_tuples = {}
+
+def _intern_value(field, value):
+    """繰り返し現れる文字列・バージョンタプルを共有オブジェクトにする"""
+    if isinstance(value, str):
+        if field in _INTERNED_FIELDS or len(value) <= _INTERN_MAX_LENGTH:
+            return sys.intern(value)
+        return value
+    if field in ('version', 'blender_version') and value is not None:
+        value = tuple(value)
+        return _interned_tuples.setdefault(value, value)
+    return value
+
+class AddonRecord:
+    """辞書と同じ書き方（record['name'], record.get(...)）で使えるスロット付きレコード
+
+    未設定のフィールドは辞書にキーが無いのと同じ扱い。JSON化など外部に渡すときは to_dict() を使う。
+    """
+    __slots__ = ADDON_RECORD_FIELDS
+    
+    def __init__(self, fields=None):
+        if fields:
+            for key, value in fields.items():
+                self[key] = value
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key, value):
+        if key not in ADDON_RECORD_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, _intern_value(key, value))
+    
+    def __contains__(self, key):
+        return key in ADDON_RECORD_FIELDS and hasattr(self, key)
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def keys(self):
+        return [field for field in ADDON_RECORD_FIELDS if hasattr(self, field)]
+    
+    def items(self):
+        return [(field, getattr(self, field)) for field in self.keys()]
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def __len__(self):
+        return len(self.keys())
+    
+    def copy(self):
+        record = AddonRecord.__new__(AddonRecord)
+        for field in ADDON_RECORD_FIELDS:
+            if hasattr(self, field):
+                setattr(record, field, getattr(self, field))
+        return record
+    
+    def to_dict(self):
+        return dict(self.items())
+    
+    def __eq__(self, other):
+        if isinstance(other, (AddonRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+    
+    def __repr__(self):
+        return f"AddonRecord({self.to_dict()!r})"
+
+# 検索用の正規化・トークン化（NFKC + casefold + カタカナ→ひらがな、CJKは2文字ずつ）
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+_CJK_CHARS = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+_TOKEN_PATTERN = re.compile(f'([{_CJK_CHARS}]+)|([^\\W{_CJK_CHARS}]+)')
+
+def normalize_text(text):
+    """全角/半角・大文字/小文字・カタカナ/ひらがなの違いを吸収した文字列"""
+    return unicodedata.normalize('NFKC', text or '').casefold().translate(_KATAKANA_TO_HIRAGANA)
+
+def tokenize_text(text, normalized=False):
+    """英数字は単語単位、CJKは文字bigram（1文字だけならその文字）のトークン集合"""
+    if not normalized:
+        text = normalize_text(text)
+    tokens = set()
+    for cjk, word in _TOKEN_PATTERN.findall(text):
+        if word:
+            tokens.add(word)
+        elif len(cjk) == 1:
+            tokens.add(cjk)
+        else:
+            tokens.update(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+# 検索キーワードの補完（履歴とアドオン名の接頭辞トライ）
+AUTOCOMPLETE_TOP_K = 8
+AUTOCOMPLETE_HALF_LIFE_DAYS = 90  # この日数ごとに新しい検索の重みが2倍になる
+AUTOCOMPLETE_NAME_AGE_DAYS = 365  # アドオン名は「1年前に1回検索した」のと同じ重み（履歴を優先する）
+
+def recency_weight(timestamp=None):
+    """新しいほど大きい重み（古い項目を毎回減衰させずに済むよう、新しい項目を増幅する）"""
+    if timestamp is None:
+        timestamp = time.time()
+    return 2.0 ** ((timestamp - 1577836800) / 86400 / AUTOCOMPLETE_HALF_LIFE_DAYS)
+
+class _TrieNode:
+    __slots__ = ('children', 'top')
+    
     def __init__(self):
+        self.children = {}
+        self.top = []  # (スコア, 正規化済みキー) をスコア降順で最大 AUTOCOMPLETE_TOP_K 件
+
+class AutocompleteTrie:
+    """正規化した文字列の接頭辞トライ（各ノードに上位k件を持たせ、入力1文字ごとの補完を定数時間にする）
+
+    スコアは加算のみ（頻度×新しさ）。項目を消すときは rebuild で作り直す。
+    """
+    def __init__(self, top_k=AUTOCOMPLETE_TOP_K):
+        self.top_k = top_k
+        self.clear()
+    
+    def clear(self):
+        self.root = _TrieNode()
+        self.scores = {}  # 正規化済みキー -> スコア
+        self.display = {}  # 正規化済みキー -> 表示用の文字列
+    
+    def rebuild(self, entries):
+        """(文字列, 重み) の列から作り直す"""
+        self.clear()
+        for text, weight in entries:
+            self.add(text, weight)
+    
+    def add(self, text, weight=1.0):
+        """文字列の重みを加算し、経路上の上位k件を更新"""
+        key = normalize_text(text).strip()
+        if not key:
+            return
+        score = self.scores.get(key, 0.0) + weight
+        self.scores[key] = score
+        self.display.setdefault(key, text.strip())
+        
+        node = self.root
+        self._update_top(node, key, score)
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+            self._update_top(node, key, score)
+    
+    def _update_top(self, node, key, score):
+        top = [entry for entry in node.top if entry[1] != key]
+        if len(top) >= self.top_k and score <= top[-1][0]:
+            return
+        top.append((score, key))
+        top.sort(key=lambda entry: -entry[0])
+        node.top = top[:self.top_k]  # 参照の差し替えだけなので読み取り側はロック不要
+    
+    def suggest(self, prefix, k=None):
+        """接頭辞に一致する上位k件（表示用の文字列）"""
+        node = self.root
+        for char in normalize_text(prefix).lstrip():
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.display[key] for _, key in node.top[:k or self.top_k]]
+
+# ブックマーク（IDで管理し、一覧の位置ではなくIDで操作する）
+BOOKMARK_PAGE_SIZE = 200  # ブックマーク一覧に一度に並べる件数
+
+class BookmarkStore:
+    """ID -> ブックマークの集合（URL索引で重複判定、並びは追加順）
+
+    各ブックマークは bookmarks.json と同じ辞書で、安定したIDを 'id' に持つ。
+    """
+    def __init__(self, bookmarks=()):
+        self._items = {}  # id -> ブックマーク（挿入順を保持）
+        self._by_url = {}  # URL -> id
+        self._search_text = {}  # id -> 絞り込み用の正規化済みテキスト
+        self._next_id = 1
+        for bookmark in bookmarks:
+            self.add(bookmark)
+    
+    def add(self, bookmark):
+        """追加してIDを返す（同じURLが既にあればNone）"""
+        url = bookmark.get('url')
+        if not url or url in self._by_url:
+            return None
+        bookmark_id = bookmark.get('id')
+        if not isinstance(bookmark_id, int) or bookmark_id in self._items:
+            bookmark_id = self._next_id
+        bookmark['id'] = bookmark_id
+        self._next_id = max(self._next_id, bookmark_id + 1)
+        self._items[bookmark_id] = bookmark
+        self._by_url[url] = bookmark_id
+        return bookmark_id
+    
+    def remove(self, bookmark_id):
+        """IDで削除（削除したブックマークを返す）"""
+        bookmark = self._items.pop(bookmark_id, None)
+        if bookmark is not None:
+            self._by_url.pop(bookmark['url'], None)
+            self._search_text.pop(bookmark_id, None)
+        return bookmark
+    
+    def get(self, bookmark_id):
+        return self._items.get(bookmark_id)
+    
+    def find_url(self, url):
+        """URLからブックマークを引く"""
+        bookmark_id = self._by_url.get(url)
+        return None if bookmark_id is None else self._items[bookmark_id]
+    
+    def __contains__(self, url):
+        return url in self._by_url
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def __iter__(self):
+        return iter(list(self._items.values()))
+    
+    def to_list(self):
+        """保存・APIでの受け渡し用のリスト"""
+        return list(self._items.values())
+    
+    def filter_ids(self, query=''):
+        """名前・URL・説明に正規化済みクエリを含むIDを新しい順で返す"""
+        ids = list(reversed(self._items))
+        query = normalize_text(query).strip()
+        if not query:
+            return ids
+        matched = []
+        for bookmark_id in ids:
+            text = self._search_text.get(bookmark_id)
+            if text is None:
+                bookmark = self._items[bookmark_id]
+                text = normalize_text(" ".join(
+                    (bookmark.get('name', ''), bookmark['url'], bookmark.get('description', ''))))
+                self._search_text[bookmark_id] = text
+            if query in text:
+                matched.append(bookmark_id)
+        return matched
+
+# ブックマークの一括インポート・エクスポート（ブラウザのHTML / JSON Lines）
+BOOKMARK_FORMATS = ('html', 'ndjson')
+BOOKMARK_READ_CHUNK = 64 * 1024
+
+def bookmark_format_from_path(path):
+    """拡張子からブックマークファイルの形式を判定"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.html', '.htm'):
+        return 'html'
+    if ext in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    raise ValueError(f"未対応のブックマーク形式です: {path}")
+
+class NetscapeBookmarkParser(HTMLParser):
+    """ブラウザがエクスポートするNetscape形式のHTMLから <A> と直後の <DD> を拾うパーサー"""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.items = []  # feed() ごとに取り出す
+        self._current = None
+        self._text = []
+        self._in_description = False
+        self._last = None
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            attrs = dict(attrs)
+            href = attrs.get('href') or ''
+            self._last = None  # 取り込まないリンクの <DD> を前のブックマークに付けない
+            if href.startswith(('http://', 'https://')):
+                self._current = {'url': href, 'add_date': attrs.get('add_date')}
+                self._text = []
+        elif tag == 'dd':
+            self._in_description = self._last is not None
+            self._text = []
+        elif tag in ('dt', 'dl', 'h3'):
+            if self._in_description:
+                self._finish_description()
+            if tag in ('dl', 'h3'):
+                # フォルダの <DD> は直前のブックマークの説明ではない
+                self._last = None
+    
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._current is not None:
+            self._current['name'] = "".join(self._text).strip() or self._current['url']
+            self._last = self._current
+            self.items.append(self._current)
+            self._current = None
+        elif tag == 'dl':
+            if self._in_description:
+                self._finish_description()
+            self._last = None
+    
+    def handle_data(self, data):
+        if self._current is not None or self._in_description:
+            self._text.append(data)
+    
+    def _finish_description(self):
+        self._last['description'] = "".join(self._text).strip()
+        self._in_description = False
+        self._last = None
+
+def _bookmark_from_import(item):
+    """インポートした項目を bookmarks.json の形式にそろえる"""
+    timestamp = item.get('timestamp')
+    add_date = item.get('add_date')
+    if not timestamp and add_date:
+        try:
+            timestamp = datetime.fromtimestamp(int(add_date)).isoformat()
+        except (TypeError, ValueError, OSError, OverflowError):
+            timestamp = None
+    return {
+        "name": item.get('name') or item['url'],
+        "url": item['url'],
+        "description": item.get('description') or "インポートしたブックマーク",
+        "timestamp": timestamp or datetime.now().isoformat()
+    }
+
+def iter_import_bookmarks(path, fmt=None):
+    """ブックマークファイルを少しずつ読みながら1件ずつ返す"""
+    fmt = fmt or bookmark_format_from_path(path)
+    if fmt == 'ndjson':
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(item, dict) and item.get('url'):
+                    yield _bookmark_from_import(item)
+        return
+    
+    parser = NetscapeBookmarkParser()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        while True:
+            chunk = f.read(BOOKMARK_READ_CHUNK)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            # 説明(<DD>)が後から付く可能性のある最後の1件は次のチャンクまで残す
+            ready, parser.items = parser.items[:-1], parser.items[-1:]
+            for item in ready:
+                yield _bookmark_from_import(item)
+    parser.close()
+    for item in parser.items:
+        yield _bookmark_from_import(item)
+
+def write_bookmarks_file(bookmarks, path, fmt=None):
+    """ブックマークを1件ずつ書き出す（件数を返す）"""
+    fmt = fmt or bookmark_format_from_path(path)
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        if fmt == 'html':
+            f.write("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"
+                    '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+                    "<TITLE>Bookmarks</TITLE>\n<H1>Bookmarks</H1>\n<DL><p>\n")
+        for bookmark in bookmarks:
+            if fmt == 'html':
+                try:
+                    add_date = int(datetime.fromisoformat(bookmark.get('timestamp', '')).timestamp())
+                except (TypeError, ValueError):
+                    add_date = 0
+                f.write(f'    <DT><A HREF="{html.escape(bookmark["url"])}" ADD_DATE="{add_date}">'
+                        f'{html.escape(bookmark.get("name", ""))}</A>\n')
+                if bookmark.get('description'):
+                    f.write(f"    <DD>{html.escape(bookmark['description'])}\n")
+            else:
+                f.write(json.dumps(bookmark, ensure_ascii=False) + "\n")
+            count += 1
+        if fmt == 'html':
+            f.write("</DL><p>\n")
+    return count
+
+# ファセット検索（カテゴリ・作者・対応Blender・タイプ・フォルダ）
+FACET_FIELDS = ('category', 'author', 'blender_version', 'type', 'folder')
+SORT_FIELDS = ('name', 'version', 'file_size', 'modified_date', 'blender_version')
+LOCAL_PAGE_SIZE = 200  # ローカル一覧で一度に描画する件数
+
+def facet_values(addon):
+    """アドオンの各ファセットの値"""
+    # 文字列などの不正な値でも (major, minor) の整数タプルに揃える（不明は (0, 0)）
+    blender_version = (version_tuple(addon.get('blender_version')) + (0, 0))[:2]
+    return {
+        'category': addon.get('category') or 'その他',
+        'author': addon.get('author') or '不明',
+        'blender_version': blender_version,
+        'type': addon.get('type') or '',
+        'folder': addon.get('folder_path') or '',
+    }
+
+def _bit_positions(bits):
+    """ビット集合から立っている位置を昇順で列挙"""
+    binary = bin(bits)[:1:-1]
+    return [match.start() for match in re.finditer('1', binary)]
+
+class FacetIndex:
+    """ファセットごとの値 -> 該当レコード位置のビット集合（Pythonのintをビットセットとして使う）
+
+    複数条件の絞り込みはビット演算のAND/ORだけで行い、アドオン辞書を走査しない。
+    blender_version は「指定バージョン以上を要求するアドオン」で絞り込む。
+    """
+    def __init__(self):
+        self.clear()
+    
+    def clear(self):
+        self.records = []
+        self.alive = 0
+        self.postings = {field: {} for field in FACET_FIELDS}
+        self._positions = {}  # file_path -> 位置
+    
+    def rebuild(self, addons):
+        """スキャン結果から作り直す"""
+        self.clear()
+        for addon in addons:
+            self.add(addon)
+    
+    def add(self, addon):
+        """1件追加（同じパスがあれば置き換え）"""
+        self.remove(addon['file_path'])
+        position = len(self.records)
+        self.records.append(addon)
+        self._positions[addon['file_path']] = position
+        bit = 1 << position
+        self.alive |= bit
+        for field, value in facet_values(addon).items():
+            postings = self.postings[field]
+            postings[value] = postings.get(value, 0) | bit
+    
+    def remove(self, file_path):
+        """1件削除（位置は再利用せずビットを落とすだけ）"""
+        position = self._positions.pop(file_path, None)
+        if position is None:
+            return
+        mask = ~(1 << position)
+        self.alive &= mask
+        for field, value in facet_values(self.records[position]).items():
+            postings = self.postings[field]
+            postings[value] &= mask
+            if not postings[value]:
+                del postings[value]
+        self.records[position] = None
+    
+    def _field_bits(self, field, selected):
+        """1つのファセットの条件に合うビット集合（Noneは条件なし）"""
+        if selected is None:
+            return self.alive
+        postings = self.postings[field]
+        if field == 'blender_version' and selected != (0, 0):
+            bits = 0
+            for value, value_bits in postings.items():
+                if value >= selected:
+                    bits |= value_bits
+            return bits
+        return postings.get(selected, 0)
+    
+    def match_bits(self, filters, exclude_field=None):
+        """全条件のAND（exclude_fieldの条件は除く）"""
+        bits = self.alive
+        for field, selected in filters.items():
+            if field != exclude_field and selected is not None:
+                bits &= self._field_bits(field, selected)
+        return bits
+    
+    def query(self, filters):
+        """条件に合うアドオンを元の順序で返す"""
+        return [self.records[position] for position in _bit_positions(self.match_bits(filters))]
+    
+    def counts(self, filters):
+        """各ファセット値の件数（他のファセットの条件を適用したライブ件数）"""
+        result = {}
+        for field in FACET_FIELDS:
+            base = self.match_bits(filters, exclude_field=field)
+            if field == 'blender_version':
+                # 「このバージョン以上」の件数（不明はそれ単独の件数）
+                values = sorted(self.postings[field], reverse=True)
+                counts = {}
+                cumulative = 0
+                for value in values:
+                    value_bits = self.postings[field][value] & base
+                    if value == (0, 0):
+                        counts[value] = value_bits.bit_count()
+                        continue
+                    cumulative |= value_bits
+                    counts[value] = cumulative.bit_count()
+                result[field] = counts
+            else:
+                result[field] = {
+                    value: (bits & base).bit_count()
+                    for value, bits in self.postings[field].items()
+                }
+        return result
+
+# 検索元（プロバイダー）の登録
+SEARCH_DEADLINE = 12.0  # 検索全体の締め切り（秒）。間に合わなかった検索元は結果に含めない
+# 時間切れ後も応答待ちで走り続ける検索の分だけ、検索元の同時実行数の合計より多めに確保する
+SEARCH_WORKERS = 16
+
+class SearchProvider:
+    """検索元の定義（クエリ -> 結果リストの関数と、検索元ごとの時間・同時実行数・キャッシュ設定）
+
+    結果は _display_results が扱う辞書（name, description, url, type）のリスト。
+    """
+    def __init__(self, name, func, modes=('web', 'both'), timeout=10.0, max_concurrency=2, cache_ttl=0):
+        self.name = name
+        self.func = func
+        self.modes = tuple(modes)
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+    
+    def run(self, query, wait_until=None):
+        """同時実行数の上限を守って検索（空きを待つ時間も持ち時間に含める）"""
+        wait_time = self.timeout if wait_until is None else max(0.0, wait_until - time.monotonic())
+        if not self.slots.acquire(timeout=wait_time):
+            raise TimeoutError(f"{self.name}: 同時実行数の上限に達しています")
+        try:
+            return self.func(query)
+        finally:
+            self.slots.release()
+
+# オフライン用のエクステンションカタログ索引（メモリマップで開き、必要な行だけデコードする）
+#   ヘッダー | 検索テキストの開始位置(u64 × 件数+1) | 正規化済み検索テキスト（\0区切り）
+#            | レコードの開始位置(u64 × 件数+1) | レコード本体（1件1JSON）
+DEFAULT_CATALOG_INDEX = "extensions_catalog.idx"
+CATALOG_MAGIC = b'ADDONCAT'
+CATALOG_VERSION = 1
+CATALOG_HEADER = struct.Struct('<8sIIQQQQ')  # magic, version, 件数, 各セクションの開始位置
+CATALOG_MAX_RESULTS = 20
+
+def catalog_entries_from_dump(path):
+    """extensions.blender.org 形式（{"data": [...]}）または配列のJSONからカタログ項目を作る"""
+    with open(path, 'r', encoding='utf-8') as f:
+        dump = json.load(f)
+    items = dump.get('data', []) if isinstance(dump, dict) else dump
+    for item in items:
+        if not isinstance(item, dict) or not (item.get('id') or item.get('name')):
+            continue
+        extension_id = item.get('id') or item.get('name')
+        yield {
+            'id': extension_id,
+            'name': item.get('name') or extension_id,
+            'description': item.get('tagline') or item.get('description') or '',
+            'version': item.get('version') or '',
+            'author': item.get('maintainer') or item.get('author') or '',
+            'tags': list(item.get('tags') or []),
+            'type': item.get('type') or 'add-on',
+            'blender_version_min': item.get('blender_version_min') or '',
+            'url': (item.get('website') or item.get('url')
+                    or f"https://extensions.blender.org/add-ons/{extension_id}/"),
+            'archive_url': item.get('archive_url') or '',
+        }
+
+def build_catalog_index(entries, output_path):
+    """カタログ項目から索引ファイルを作成（書き込み後に置き換えるので開いている読み手を壊さない）"""
+    text_offsets = array('Q', [0])
+    record_offsets = array('Q', [0])
+    texts = []
+    records = []
+    for entry in entries:
+        text = normalize_text(" ".join((
+            entry['name'], entry['description'], entry['author'], " ".join(entry['tags']), entry['id']
+        ))).replace('\0', ' ').encode('utf-8') + b'\0'
+        record = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        texts.append(text)
+        records.append(record)
+        text_offsets.append(text_offsets[-1] + len(text))
+        record_offsets.append(record_offsets[-1] + len(record))
+    
+    count = len(records)
+    text_index_pos = CATALOG_HEADER.size
+    text_pos = text_index_pos + len(text_offsets) * 8
+    record_index_pos = text_pos + text_offsets[-1]
+    record_pos = record_index_pos + len(record_offsets) * 8
+    
+    temp_path = output_path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(CATALOG_HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, count,
+                                    text_index_pos, text_pos, record_index_pos, record_pos))
+        f.write(text_offsets.tobytes())
+        f.writelines(texts)
+        f.write(record_offsets.tobytes())
+        f.writelines(records)
+    os.replace(temp_path, output_path)
+    return count
+
+class CatalogIndex:
+    """カタログ索引の読み手（初回検索時にメモリマップで開き、ファイルが更新されたら開き直す）"""
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime_ns = None
+        self._file = None
+        self._map = None
+    
+    def _ensure_open(self):
+        """未オープンまたは更新済みなら開き直す（開けなければFalse）"""
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self.close()
+            return False
+        if self._map is not None and mtime_ns == self._mtime_ns:
+            return True
+        self.close()
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, text_index_pos, text_pos, record_index_pos, record_pos = \
+            CATALOG_HEADER.unpack_from(self._map, 0)
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+            self.close()
+            raise ValueError(f"カタログ索引の形式が違います: {self.path}")
+        self.count = count
+        self._text_pos = text_pos
+        self._record_pos = record_pos
+        view = memoryview(self._map)
+        self._text_offsets = view[text_index_pos:text_pos].cast('Q')
+        self._record_offsets = view[record_index_pos:record_pos].cast('Q')
+        self._mtime_ns = mtime_ns
+        return True
+    
+    def close(self):
+        for name in ('_text_offsets', '_record_offsets'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._mtime_ns = None
+    
+    def __len__(self):
+        with self._lock:
+            return self.count if self._ensure_open() else 0
+    
+    def record(self, index):
+        """index番目のレコードだけをデコード"""
+        start = self._record_pos + self._record_offsets[index]
+        end = self._record_pos + self._record_offsets[index + 1]
+        return json.loads(self._map[start:end].decode('utf-8'))
+    
+    def search(self, query, limit=CATALOG_MAX_RESULTS):
+        """正規化したクエリの単語をすべて含む項目を返す（最長の単語で mmap.find し、残りは該当行だけ確認）"""
+        words = [word.encode('utf-8') for word in normalize_text(query).split()]
+        if not words:
+            return []
+        words.sort(key=len, reverse=True)
+        anchor, rest = words[0], words[1:]
+        with self._lock:
+            if not self._ensure_open() or not self.count:
+                return []
+            results = []
+            text_end = self._text_pos + self._text_offsets[self.count]
+            position = self._map.find(anchor, self._text_pos, text_end)
+            while position != -1 and len(results) < limit:
+                index = bisect.bisect_right(self._text_offsets, position - self._text_pos) - 1
+                start = self._text_pos + self._text_offsets[index]
+                end = self._text_pos + self._text_offsets[index + 1]
+                if all(self._map.find(word, start, end) != -1 for word in rest):
+                    results.append(self.record(index))
+                position = self._map.find(anchor, end, text_end)
+            return results
+
+# 常駐サービス（ローカルHTTP/JSON API）
+DEFAULT_DAEMON_PORT = 8765
+DAEMON_HOSTS = ('127.0.0.1', 'localhost')  # Hostヘッダーで受け付ける名前（DNSリバインディング対策）
+DAEMON_ROUTES = {  # パス -> 受け付けるメソッド（状態を変えるものはPOSTのみ）
+    '/health': ('GET',),
+    '/search': ('GET',),
+    '/scan': ('POST',),
+    '/inventory': ('GET',),
+    '/bookmarks': ('GET',),
+}
+WEB_CACHE_TTL = 10 * 60  # Web検索結果のキャッシュ有効期間（秒）
+
+def folder_set(folders):
+    """比較用に正規化したアドオンフォルダの集合"""
+    return {os.path.normcase(os.path.realpath(str(folder))) for folder in folders or ()}
+
+class AddonQueryHandler(BaseHTTPRequestHandler):
+    """常駐サービスのリクエスト処理（search / scan / inventory / bookmarks / health）"""
+    server_version = "AddonSearchDaemon/1.0"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _allowed_host(self):
+        """Hostヘッダーが 127.0.0.1 / localhost:<ポート> か"""
+        port = self.server.server_address[1]
+        return self.headers.get('Host', '') in {f"{host}:{port}" for host in DAEMON_HOSTS}
+    
+    def _handle(self, method):
+        app = self.server.app
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        started = time.perf_counter()
+        if not self._allowed_host():
+            self._send_json({'error': 'forbidden host'}, 403)
+            return
+        methods = DAEMON_ROUTES.get(parsed.path)
+        if methods is None:
+            self._send_json({'error': 'not found'}, 404)
+            return
+        if method not in methods:
+            self._send_json({'error': 'method not allowed'}, 405, {'Allow': ", ".join(methods)})
+            return
+        try:
+            if parsed.path == '/health':
+                payload = {'status': 'ok', 'addons': len(app.local_addons),
+                           'folders': [str(folder) for folder in app.addon_folders]}
+            elif parsed.path == '/search':
+                query = params.get('q', [''])[0].strip()
+                mode = params.get('mode', ['both'])[0]
+                if not query:
+                    self._send_json({'error': 'q is required'}, 400)
+                    return
+                payload = {'results': app.collect_search_results(query, mode)}
+            elif parsed.path == '/scan':
+                payload = {'count': len(app.daemon_rescan())}
+            elif parsed.path == '/inventory':
+                payload = {'addons': [addon_to_record(addon) for addon in app.local_addons]}
+            else:
+                payload = {'bookmarks': app.bookmarks.to_list()}
+        except Exception as e:
+            self._send_json({'error': str(e)}, 500)
+            return
+        payload['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        self._send_json(payload)
+    
+    def do_GET(self):
+        self._handle('GET')
+    
+    def do_POST(self):
+        self._handle('POST')
+
+class DaemonClient:
+    """常駐サービスへのクライアント"""
+    def __init__(self, base_url, timeout=5):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+    
+    def _request(self, path, params=None, timeout=None, method='GET'):
+        url = f"{self.base_url}{path}"
+        if params:
+            url += "?" + urlencode(params)
+        request = urllib.request.Request(url, data=b'' if method == 'POST' else None, method=method)
+        with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    
+    def is_alive(self):
+        """サービスが応答するか（短いタイムアウトで確認）"""
+        try:
+            return self._request('/health', timeout=0.3).get('status') == 'ok'
+        except Exception:
+            return False
+    
+    def serves_folders(self, folders):
+        """サービスが同じアドオンフォルダを対象にしているか（違えば結果も違うので使わない）"""
+        try:
+            info = self._request('/health', timeout=0.3)
+        except Exception:
+            return False
+        return info.get('status') == 'ok' and folder_set(info.get('folders')) == folder_set(folders)
+    
+    def search(self, query, mode='both'):
+        return self._request('/search', {'q': query, 'mode': mode})['results']
+    
+    def scan(self):
+        return self._request('/scan', method='POST')['count']
+    
+    def inventory(self):
+        return self._request('/inventory')['addons']
+
+# インベントリのスナップショット（1行目がヘッダー、以降は1行1アドオンのJSON Lines）
+SNAPSHOT_VERSION = 2
+
+# 前回スキャン結果のキャッシュ（起動直後の表示用）
+INVENTORY_CACHE_VERSION = 1
+
+def blender_version_from_path(path):
+    """パス中の '4.2' のようなBlenderバージョンフォルダ名を取り出す"""
+    for part in reversed(re.split(r'[\\/]', str(path))):
+        if _is_version_dir(part):
+            return part
+    return None
+
+def snapshot_root_label(folder):
+    """アドオンルートのラベル（'4.2/scripts/addons' や '4.2/extensions/user_default'、なければフォルダ名）"""
+    parts = re.split(r'[\\/]', str(folder).rstrip('/\\'))
+    for index in range(len(parts) - 1, -1, -1):
+        if _is_version_dir(parts[index]):
+            return "/".join(parts[index:])
+    return parts[-1]
+
+def snapshot_key(addon):
+    """マシン間でも比較できるキー（ルートのラベル/ルートからの相対パス）"""
+    try:
+        relative = os.path.relpath(addon['file_path'], addon['folder_path'])
+    except ValueError:
+        # Windowsで別ドライブの場合
+        relative = os.path.basename(str(addon['file_path']).rstrip('/\\'))
+    return f"{snapshot_root_label(addon['folder_path'])}/{relative.replace(os.sep, '/')}"
+
+def write_snapshot(path, records, header=None):
+    """スナップショットを書き出す（recordsはkey付きの辞書）"""
+    header = dict(header or {})
+    header.setdefault('snapshot_version', SNAPSHOT_VERSION)
+    header.setdefault('created', datetime.now().isoformat(timespec='seconds'))
+    header.setdefault('host', platform.node())
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'header': header}, ensure_ascii=False) + "\n")
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def load_snapshot(path):
+    """スナップショットを読み込む: (ヘッダー, {key: record})"""
+    header = {}
+    records = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if 'header' in item:
+                header = item['header']
+                continue
+            if header.get('snapshot_version', 1) < 2 and item.get('folder_path') and item.get('file_path'):
+                # 旧形式（バージョン/モジュール名）のキーは現在の形式で付け直す
+                item['key'] = snapshot_key(item)
+            records[item['key']] = item
+    return header, records
+
+def diff_snapshots(old_records, new_records):
+    """2つのスナップショットの差分（キーによるハッシュ結合なので線形時間）"""
+    added = [new_records[key] for key in new_records.keys() - old_records.keys()]
+    removed = [old_records[key] for key in old_records.keys() - new_records.keys()]
+    version_changed = []
+    content_changed = []
+    for key in old_records.keys() & new_records.keys():
+        old, new = old_records[key], new_records[key]
+        if old.get('version') != new.get('version'):
+            version_changed.append((old, new))
+        elif old.get('content_hash') and new.get('content_hash') and old['content_hash'] != new['content_hash']:
+            content_changed.append((old, new))
+    
+    sort_key = lambda record: record['key']
+    return {
+        'added': sorted(added, key=sort_key),
+        'removed': sorted(removed, key=sort_key),
+        'version_changed': sorted(version_changed, key=lambda pair: pair[0]['key']),
+        'content_changed': sorted(content_changed, key=lambda pair: pair[0]['key']),
+    }
+
+def format_snapshot_diff(diff, old_label="old", new_label="new"):
+    """差分を文字列に整形"""
+    lines = [
+        f"🔍 {old_label} → {new_label}",
+        f"➕ 追加: {len(diff['added'])}  ➖ 削除: {len(diff['removed'])}  "
+        f"🔢 バージョン変更: {len(diff['version_changed'])}  ✏️ 内容変更: {len(diff['content_changed'])}",
+        ""
+    ]
+    for record in diff['added']:
+        lines.append(f"➕ {record['key']}  {record['name']} v{record['version']}")
+    for record in diff['removed']:
+        lines.append(f"➖ {record['key']}  {record['name']} v{record['version']}")
+    for old, new in diff['version_changed']:
+        lines.append(f"🔢 {old['key']}  {old['name']} v{old['version']} → v{new['version']}")
+    for old, new in diff['content_changed']:
+        lines.append(f"✏️ {old['key']}  {old['name']} v{old['version']}（同じバージョンで内容が異なる）")
+    if not any(diff.values()):
+        lines.append("変更はありません")
+    return "\n".join(lines)
+
+# インストール済みアドオン × インストール済みBlenderの互換性マトリクス
+COMPAT_STATUSES = ('compatible', 'too_new', 'unknown')
+COMPAT_LABELS = {'compatible': '✅', 'too_new': '⛔', 'unknown': '❔'}
+COMPAT_EXPORT_FORMATS = ('ndjson', 'csv')
+
+def installed_blender_versions(folders):
+    """アドオンフォルダのパスから見つかるBlenderバージョン（(major, minor) の昇順）"""
+    versions = set()
+    for folder in folders:
+        label = blender_version_from_path(folder)
+        if label:
+            versions.add(tuple(int(part) for part in label.split('.')))
+    return sorted(versions)
+
+def compat_status(required, version):
+    """アドオンの要求バージョンとBlenderバージョンの判定"""
+    if not required:
+        return 'unknown'
+    return 'compatible' if required <= version else 'too_new'
+
+class CompatibilityMatrix:
+    """file_path ごとに全バージョンの判定を前もって持つ表（スキャン結果の増減に合わせて1行ずつ更新）"""
+    def __init__(self, versions=()):
+        self.versions = sorted(set(versions))
+        self.rows = {}  # file_path -> {'key', 'name', 'required', 'status': {version: 判定}}
+    
+    def set_versions(self, versions):
+        """Blenderバージョンの一覧が変わったときだけ全行を計算し直す"""
+        versions = sorted(set(versions))
+        if versions == self.versions:
+            return
+        self.versions = versions
+        for row in self.rows.values():
+            row['status'] = {version: compat_status(row['required'], version) for version in versions}
+    
+    def update(self, addon):
+        """1件追加・更新"""
+        required = version_tuple(addon.get('blender_version'))[:2]
+        required = required if any(required) else None
+        self.rows[addon['file_path']] = {
+            'key': snapshot_key(addon),
+            'name': addon['name'],
+            'required': required,
+            'status': {version: compat_status(required, version) for version in self.versions},
+        }
+    
+    def remove(self, file_path):
+        self.rows.pop(file_path, None)
+    
+    def rebuild(self, addons):
+        self.rows = {}
+        for addon in addons:
+            self.update(addon)
+    
+    def status(self, file_path, version):
+        """判定を返す（行かバージョンが無ければNone）"""
+        row = self.rows.get(file_path)
+        return row['status'].get(tuple(version)) if row else None
+    
+    def summary(self):
+        """バージョンごとの判定件数"""
+        counts = {version: dict.fromkeys(COMPAT_STATUSES, 0) for version in self.versions}
+        for row in self.rows.values():
+            for version, status in row['status'].items():
+                counts[version][status] += 1
+        return counts
+    
+    def records(self, extra_versions=()):
+        """書き出し用のフラットな辞書（extra_versions は導入予定のバージョンなど）"""
+        versions = sorted(set(self.versions) | set(extra_versions))
+        for file_path, row in sorted(self.rows.items(), key=lambda item: item[1]['key']):
+            record = {
+                'key': row['key'],
+                'name': row['name'],
+                'file_path': file_path,
+                'requires': ".".join(map(str, row['required'])) if row['required'] else None,
+            }
+            for version in versions:
+                status = row['status'].get(version) or compat_status(row['required'], version)
+                record[".".join(map(str, version))] = status
+            yield record
+
+def write_compat_matrix(matrix, path, extra_versions=(), fmt=None):
+    """互換性マトリクスを NDJSON / CSV で書き出す（件数を返す）"""
+    fmt = fmt or export_format_from_path(path)
+    if fmt not in COMPAT_EXPORT_FORMATS:
+        raise ValueError(f"互換性マトリクスは {' / '.join(COMPAT_EXPORT_FORMATS)} で書き出せます: {path}")
+    versions = sorted(set(matrix.versions) | set(extra_versions))
+    fields = ['key', 'name', 'file_path', 'requires'] + [".".join(map(str, v)) for v in versions]
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields) if fmt == 'csv' else None
+        if writer:
+            writer.writeheader()
+        for record in matrix.records(extra_versions):
+            if writer:
+                writer.writerow(record)
+            else:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def parse_version_string(value):
+    """'1.2.3' 形式のバージョン文字列をタプルに変換"""
+    if not value:
+        return (0, 0, 0)
+    numbers = [int(part) for part in re.findall(r'\d+', str(value))[:3]]
+    return tuple(numbers + [0] * (3 - len(numbers)))
+
+def version_tuple(value):
+    """bl_infoなどのバージョン値を整数タプルに揃える（文字列・不正な値も扱う）"""
+    if isinstance(value, (tuple, list)) and value and all(
+            isinstance(part, int) and not isinstance(part, bool) for part in value):
+        return tuple(value)
+    if isinstance(value, (tuple, list)):
+        value = ".".join(map(str, value))
+    return parse_version_string(value)
+
+def github_repo_from_url(url):
+    """GitHubのURLから 'owner/repo' を取り出す"""
+    if not url:
+        return None
+    # ホストが github.com のURLだけ（docs.github.com などは除外）。git@github.com:owner/repo も可
+    match = re.match(r'(?:[a-z][a-z0-9+.-]*://)?(?:[^@/\s]+@)?(?:www\.)?github\.com[/:]([\w.-]+)/([\w.-]+)',
+                     url.strip(), re.IGNORECASE)
+    if not match:
+        return None
+    owner, repo = match.groups()
+    if repo.endswith('.git'):
+        repo = repo[:-4]
+    return f"{owner}/{repo}"
+
+def _is_version_dir(name):
+    """'4.2' のようなBlenderバージョンフォルダ名か"""
+    return re.fullmatch(r'\d+\.\d+', name) is not None
+
+def _addon_dirs_in_scripts(scripts_dir):
+    """scriptsフォルダ内のアドオンフォルダ（addons / addons_core）"""
+    return [os.path.join(scripts_dir, name) for name in ('addons', 'addons_core')]
+
+def _extension_repo_dirs(extensions_dir):
+    """extensionsフォルダ内のリポジトリフォルダ（.cache / .local などは除外）"""
+    try:
+        return [entry.path for entry in os.scandir(extensions_dir)
+                if entry.is_dir() and not entry.name.startswith('.')]
+    except OSError:
+        return []
+
+def resolve_blender_addon_roots():
+    """Windows / macOS / Linux のBlenderアドオン・エクステンションのルートを検出"""
+    candidates = []
+    home = Path.home()
+    
+    # ユーザー設定フォルダ（バージョン別）
+    config_bases = [
+        os.path.join(os.environ.get('APPDATA', str(home / "AppData" / "Roaming")), "Blender Foundation", "Blender"),
+        str(home / "Library" / "Application Support" / "Blender"),
+        os.path.join(os.environ.get('XDG_CONFIG_HOME', str(home / ".config")), "blender"),
+    ]
+    for base in config_bases:
+        if not os.path.isdir(base):
+            continue
+        for version_dir in sorted(glob.glob(os.path.join(glob.escape(base), '*'))):
+            if not _is_version_dir(os.path.basename(version_dir)):
+                continue
+            candidates.append(os.path.join(version_dir, "scripts", "addons"))
+            candidates.extend(_extension_repo_dirs(os.path.join(version_dir, "extensions")))
+    
+    # 環境変数による上書き
+    user_scripts = os.environ.get('BLENDER_USER_SCRIPTS')
+    if user_scripts:
+        candidates.append(os.path.join(user_scripts, "addons"))
+    user_extensions = os.environ.get('BLENDER_USER_EXTENSIONS')
+    if user_extensions:
+        candidates.extend(_extension_repo_dirs(user_extensions))
+    system_scripts = os.environ.get('BLENDER_SYSTEM_SCRIPTS')
+    if system_scripts:
+        candidates.extend(_addon_dirs_in_scripts(system_scripts))
+    
+    # システムインストール（同梱アドオン）
+    program_files = os.environ.get('ProgramFiles', r"C:\Program Files")
+    install_patterns = [
+        os.path.join(glob.escape(program_files), "Blender Foundation", "Blender*", "*"),
+        "/Applications/Blender*.app/Contents/Resources/*",
+        "/usr/share/blender/*",
+        "/usr/local/share/blender/*",
+        "/opt/blender*/*",
+        "/snap/blender/current/*",
+    ]
+    for pattern in install_patterns:
+        for version_dir in sorted(glob.glob(pattern)):
+            if _is_version_dir(os.path.basename(version_dir)):
+                candidates.extend(_addon_dirs_in_scripts(os.path.join(version_dir, "scripts")))
+    
+    roots = []
+    seen = set()
+    for path in candidates:
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen and os.path.isdir(path):
+            seen.add(key)
+            roots.append(path)
+    return roots
+
+class BlenderStyleSearchTool:
+    def __init__(self, profile=False, profile_dir="profiles", headless=False):
         # Blender風カラーパレット
         self.colors = {
             'bg_dark': '#2d2d2d',
@@ -31,121 +1854,892 @@ class BlenderStyleSearchTool:
         
         # データファイルパス
         self.history_file = "search_history.json"
+        self.query_weights_file = "query_weights.json"
         self.bookmarks_file = "bookmarks.json"
+        self.settings_file = "settings.json"
+        self.settings = self.load_settings()
+        
+        # プロファイラ設定（--profile またはフッターのチェックで有効化）
+        self.profile_enabled = profile
+        self.profile_dir = profile_dir
+        self._profile_lock = threading.Lock()
         
         # データ初期化
         self.search_history = []
-        self.bookmarks = []
+        self.query_weights = {}  # クエリ -> 頻度×新しさの重みの合計（補完用、件数の上限なし）
+        self.bookmarks = BookmarkStore()
+        self._bookmark_view = []  # 一覧の行 -> ブックマークID（絞り込み・ページ送り後も正しく対応させる）
+        self._bookmark_rendered = 0
+        self._bookmark_filter_job = None
         
         # ローカルアドオン管理初期化
         self.local_addons = []
+        self._metadata_cache = {}  # 情報ファイルのパス -> (mtime_ns, size, addon_info)
+        self._metadata_lock = threading.Lock()  # スキャン系のワーカーとキャッシュ保存の間で共有
+        self._inventory_save_lock = threading.Lock()
+        self._size_cache = {}  # フォルダのパス -> (サブフォルダを含む最新のmtime_ns, アドオンの更新日時, 合計サイズ)
+        self._size_lock = threading.Lock()
+        self._local_render_generation = 0
+        self.hash_cache_file = "hash_cache.json"
+        self._hash_cache = None  # ファイルパス -> [mtime_ns, size, sha256]（初回使用時に読み込み）
+        self.update_cache_file = "update_cache.json"
+        self.link_check_cache_file = "link_check_cache.json"
+        self.import_cache_file = "import_cache.json"
+        self.link_status = {}  # URL -> リンク確認結果
+        self.inventory_cache_file = "inventory_cache.json"
+        self.operation_queue = OperationQueue(on_update=self._on_operation_progress)
+        self._web_cache = {}  # (検索元, クエリ) -> (取得時刻, 結果)
+        self._web_cache_lock = threading.Lock()
+        self.search_providers = {}  # 名前 -> SearchProvider（登録順に結果を並べる）
+        self._search_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS)
+        self.register_search_provider(SearchProvider(
+            'local', self.search_local, modes=('local', 'both'), timeout=5.0, max_concurrency=4))
+        self.register_search_provider(SearchProvider(
+            'github', self.search_github, timeout=10.0, max_concurrency=2, cache_ttl=WEB_CACHE_TTL))
+        self.register_search_provider(SearchProvider(
+            'google', self.search_google, timeout=2.0, max_concurrency=4))
+        self.catalog_index = CatalogIndex(self.settings.get('catalog_index', DEFAULT_CATALOG_INDEX))
+        self.register_search_provider(SearchProvider(
+            'catalog', self.search_catalog, timeout=3.0, max_concurrency=4))
+        self._scan_lock = threading.RLock()  # 探索は同時に1つだけ（daemon_rescan から入れ子で取る）
+        self._pending_scan = None  # ワーカーで探索済み・Tkスレッドでの反映待ちのアドオン一覧
+        self.daemon_client = None
+        self.facet_index = FacetIndex()
+        self.compat_matrix = CompatibilityMatrix()
+        self.facet_filters = {field: None for field in FACET_FIELDS}
+        self._view_cache = {}  # (file_path, modified_date) -> 表示用文字列とソートキー
+        self._search_cache = {}  # (file_path, modified_date) -> (正規化済みテキスト, トークン集合)
+        self.autocomplete = AutocompleteTrie()
+        self._local_view = []
+        self._local_rendered = 0
+        self.sort_field = None
+        self.sort_descending = False
+        self.scan_max_depth = DEFAULT_SCAN_MAX_DEPTH
+        self.exclude_patterns = list(DEFAULT_EXCLUDE_PATTERNS)
+        self.exclude_matcher = ExcludeMatcher(self.exclude_patterns)
+        self.set_scan_options(self.settings.get('scan_max_depth'), self.settings.get('exclude_patterns'))
+        self.custom_folders = list(self.settings.get('custom_folders', []))
         self.addon_folders = self.get_blender_addon_folders()
         
+        # GUIなし（CLI）の場合はデータ読み込みのみ
+        self.headless = headless
+        if headless:
+            self.load_data()
+            return
+        
         # GUI初期化
         self.init_gui()
         self.load_data()
         
+        # 前回のスキャン結果をすぐに表示し、裏で変更分だけ確認する
+        if self.load_inventory_cache():
+            self._local_scanned = True
+            self.display_local_addons()
+            self.root.after(500, self.revalidate_local_addons)
+        
         # 初期履歴表示（UI作成後）
         self.root.after(100, self.refresh_history)
     
-    def get_blender_addon_folders(self):
-        """Blenderのアドオンフォルダを取得"""
+    def get_blender_addon_folders(self, force_refresh=False):
+        """Blenderのアドオンフォルダを取得（検出結果はsettings.jsonにキャッシュ）"""
+        env_signature = {name: os.environ.get(name, '') for name in BLENDER_ROOT_ENV_VARS}
+        cached_roots = self.settings.get('resolved_roots')
+        resolved_at = self.settings.get('resolved_at', 0)
+        
+        cache_valid = (
+            not force_refresh
+            and isinstance(cached_roots, list)
+            and self.settings.get('resolved_env') == env_signature
+            and time.time() - resolved_at < ROOT_CACHE_TTL
+        )
+        
+        if cache_valid:
+            roots = cached_roots
+        else:
+            roots = resolve_blender_addon_roots()
+            self.settings['resolved_roots'] = roots
+            self.settings['resolved_at'] = time.time()
+            self.settings['resolved_env'] = env_signature
+            self.save_settings()
+        
+        # 検出フォルダ + カスタムフォルダ（重複除外）
         folders = []
+        for folder in list(roots) + list(self.custom_folders):
+            if folder not in folders:
+                folders.append(folder)
+        return folders
+    
+    def refresh_addon_folders(self):
+        """アドオンフォルダを再検出"""
+        self.addon_folders = self.get_blender_addon_folders(force_refresh=True)
+        return self.addon_folders
+    
+    def extract_addon_info(self, file_path, stat_result=None, use_cache=True):
+        """アドオン情報を抽出（bl_info / blender_manifest.toml、未変更ならキャッシュを使用）"""
+        try:
+            if stat_result is None:
+                stat_result = file_path.stat()
+            
+            # 更新日時とサイズが同じならファイルを読み直さない
+            cache_key = str(file_path)
+            cached = self._metadata_cache.get(cache_key)
+            if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+                return cached[2].copy()
+            
+            if file_path.name == MANIFEST_FILENAME:
+                addon_info = self.extract_manifest_info(file_path, stat_result)
+            else:
+                addon_info = self._extract_bl_info(file_path, stat_result)
+            
+            if addon_info is None:
+                return None
+            addon_info = AddonRecord(addon_info)
+            if not use_cache:
+                return addon_info
+            with self._metadata_lock:
+                self._metadata_cache[cache_key] = (stat_result.st_mtime_ns, stat_result.st_size, addon_info)
+            return addon_info.copy()
+        
+        except Exception as e:
+            print(f"ファイル読み込みエラー: {file_path} - {e}")
+            return None
+    
+    def _extract_bl_info(self, file_path, stat_result):
+        """Pythonファイルからbl_info情報を抽出"""
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        return self._bl_info_record(content, file_path.stem, stat_result.st_size, stat_result.st_mtime)
+    
+    def _bl_info_record(self, content, fallback_name, file_size, modified_date):
+        """ソースコード文字列のbl_infoからアドオン情報を作成"""
+        # bl_info辞書を正規表現で抽出
+        bl_info_pattern = r'bl_info\s*=\s*{([^}]+)}'
+        match = re.search(bl_info_pattern, content, re.DOTALL)
+        
+        if match:
+            bl_info_str = '{' + match.group(1) + '}'
+            try:
+                # リテラルのみ評価（ダウンロードしたZIPのコードは実行しない）
+                bl_info = ast.literal_eval(bl_info_str)
+                
+                addon_info = {
+                    'name': bl_info.get('name', fallback_name),
+                    'version': version_tuple(bl_info.get('version')),
+                    'description': bl_info.get('description', '説明なし'),
+                    'author': bl_info.get('author', '不明'),
+                    'category': bl_info.get('category', 'その他'),
+                    'blender_version': version_tuple(bl_info.get('blender')),
+                    'file_size': file_size,
+                    'modified_date': modified_date,
+                    'format': 'bl_info',
+                    'doc_url': bl_info.get('doc_url') or bl_info.get('wiki_url', ''),
+                    'tracker_url': bl_info.get('tracker_url', '')
+                }
+                return addon_info
+            except:
+                pass
+        
+        # bl_infoが見つからない場合のフォールバック
+        return {
+            'name': fallback_name,
+            'version': (0, 0, 0),
+            'description': 'bl_info情報が見つかりません',
+            'author': '不明',
+            'category': 'その他',
+            'blender_version': (0, 0, 0),
+            'file_size': file_size,
+            'modified_date': modified_date,
+            'format': 'bl_info',
+            'doc_url': '',
+            'tracker_url': ''
+        }
+    
+    def extract_manifest_info(self, file_path, stat_result):
+        """blender_manifest.toml（Blender 4.2+ エクステンション）から情報を抽出"""
+        try:
+            with open(file_path, 'rb') as f:
+                manifest = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            print(f"マニフェスト解析エラー: {file_path} - {e}")
+            # 解析できない場合は従来のbl_infoにフォールバック
+            init_file = file_path.parent / "__init__.py"
+            if init_file.exists():
+                return self._extract_bl_info(init_file, init_file.stat())
+            return None
+        return self._manifest_record(manifest, file_path.parent.name, stat_result.st_size, stat_result.st_mtime)
+    
+    def _manifest_record(self, manifest, fallback_name, file_size, modified_date):
+        """マニフェストの辞書からアドオン情報を作成"""
+        # テーマなどアドオン以外のエクステンションは対象外
+        if manifest.get('type', 'add-on') != 'add-on':
+            return None
+        
+        tags = manifest.get('tags') or []
+        return {
+            'name': manifest.get('name') or fallback_name,
+            'version': parse_version_string(manifest.get('version')),
+            'description': manifest.get('tagline') or '説明なし',
+            'author': manifest.get('maintainer') or '不明',
+            'category': tags[0] if tags else 'その他',
+            'blender_version': parse_version_string(manifest.get('blender_version_min')),
+            'file_size': file_size,
+            'modified_date': modified_date,
+            'format': 'manifest',
+            'doc_url': manifest.get('website', ''),
+            'tracker_url': ''
+        }
+    
+    # ZIPアーカイブ（展開せずに解析）
+    def inspect_addon_zip(self, zip_path):
+        """ZIP内のbl_info / blender_manifest.tomlだけを読んでアドオン情報を取得"""
+        try:
+            stat_result = os.stat(zip_path)
+            cached = self._metadata_cache.get(zip_path)
+            if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+                return dict(cached[2])
+            
+            with zipfile.ZipFile(zip_path) as zf:
+                layout = find_addon_in_zip(zf)
+                if layout is None:
+                    return None
+                kind, member, prefix, install_name = layout
+                
+                if kind == 'manifest':
+                    with zf.open(member) as f:
+                        manifest = tomllib.loads(f.read(ZIP_MANIFEST_LIMIT).decode('utf-8', errors='ignore'))
+                    addon_info = self._manifest_record(
+                        manifest, install_name, stat_result.st_size, stat_result.st_mtime)
+                    if addon_info is None:
+                        return None
+                    install_name = manifest.get('id') or install_name
+                else:
+                    content = read_zip_bl_info_source(zf, member)
+                    addon_info = self._bl_info_record(
+                        content, install_name, stat_result.st_size, stat_result.st_mtime)
+            
+            if not is_safe_install_name(install_name):
+                raise ValueError(f"不正なインストール名です: {install_name!r}")
+            addon_info.update({
+                'folder_path': os.path.dirname(zip_path),
+                'file_path': zip_path,
+                'type': 'zip',
+                'zip_prefix': prefix,
+                'install_name': install_name
+            })
+            with self._metadata_lock:
+                self._metadata_cache[zip_path] = (stat_result.st_mtime_ns, stat_result.st_size, addon_info)
+            return dict(addon_info)
+        except Exception as e:
+            print(f"ZIP読み込みエラー: {zip_path} - {e}")
+            return None
+    
+    def index_zip_folder(self, folder, max_workers=8):
+        """フォルダ内のZIPをまとめて並列に解析"""
+        zip_paths = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith('.zip'):
+                    zip_paths.append(entry.path)
+        zip_paths.sort()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self.inspect_addon_zip, zip_paths))
+        return [info for info in results if info]
+
+    def scan_local_addons(self):
+        """ローカルアドオンをスキャン（サブフォルダも深さ制限付きで探索）"""
+        with self._scan_lock:
+            addons = list(self.iter_local_addons())
+        self._set_local_addons(addons)
+        self.save_inventory_cache()
+        return self.local_addons
+    
+    def ensure_local_addons(self):
+        """未スキャンならスキャンしてアドオン一覧を返す（ワーカースレッドからも呼べる）
+
+        GUIのワーカースレッドでは探索だけを行い、インベントリの差し替え（索引・表示キャッシュの
+        再構築）は root.after でTkスレッドに任せる。反映前の結果は _pending_scan から返す。
+        """
+        addons = self.local_addons or self._pending_scan
+        if addons:
+            return addons
+        if self.headless or threading.current_thread() is threading.main_thread():
+            with self._scan_lock:
+                return self.local_addons or self.scan_local_addons()
+        with self._scan_lock:
+            addons = self.local_addons or self._pending_scan
+            if addons:
+                return addons
+            addons = list(self.iter_local_addons())
+            self._pending_scan = addons
+        self.root.after(0, lambda: self._apply_pending_scan(addons))
+        return addons
+    
+    def _apply_pending_scan(self, addons):
+        """ワーカーでの探索結果を反映（Tkスレッド）"""
+        if self._pending_scan is addons:
+            self._pending_scan = None
+            self._set_local_addons(addons)
+            self.save_inventory_cache()
+    
+    def _set_local_addons(self, addons):
+        """インベントリを差し替えてファセット索引と表示キャッシュを更新"""
+        self.local_addons = addons
+        self.facet_index.rebuild(self.local_addons)
+        self.compat_matrix.set_versions(installed_blender_versions(self.addon_folders))
+        self.compat_matrix.rebuild(self.local_addons)
+        # 変更のないレコードの表示キャッシュだけ残す
+        current = {(addon['file_path'], addon.get('modified_date')) for addon in self.local_addons}
+        self._view_cache = {key: view for key, view in self._view_cache.items() if key in current}
+        self._search_cache = {key: doc for key, doc in self._search_cache.items() if key in current}
+        self.rebuild_autocomplete()
+    
+    def save_inventory_cache(self):
+        """最後のスキャン結果と情報・サイズキャッシュを保存"""
+        # 他のスレッドが更新中でも壊れないよう、ロックの中で写しを取ってから組み立てる
+        with self._size_lock:
+            sizes = {path: list(entry) for path, entry in self._size_cache.items()}
+        with self._metadata_lock:
+            metadata = list(self._metadata_cache.items())
+        addons = list(self.local_addons)
+        data = {
+            'version': INVENTORY_CACHE_VERSION,
+            'folders': list(self.addon_folders),
+            'addons': [addon.to_dict() for addon in addons],
+            # ZIPの解析結果（辞書）は次回開き直せば済むので保存しない
+            'metadata': {
+                path: [mtime_ns, size, addon_info.to_dict()]
+                for path, (mtime_ns, size, addon_info) in metadata
+                if isinstance(addon_info, AddonRecord)
+            },
+            'sizes': sizes,
+        }
+        try:
+            with self._inventory_save_lock:
+                temp_path = self.inventory_cache_file + ".tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_path, self.inventory_cache_file)
+        except Exception as e:
+            print(f"インベントリキャッシュ保存エラー: {e}")
+    
+    def load_inventory_cache(self):
+        """前回のスキャン結果を復元（現在のフォルダ構成に含まれるものだけ）"""
+        try:
+            if not os.path.exists(self.inventory_cache_file):
+                return False
+            with open(self.inventory_cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"インベントリキャッシュ読み込みエラー: {e}")
+            return False
+        if data.get('version') != INVENTORY_CACHE_VERSION:
+            return False
+        
+        def restore(addon):
+            # JSONではタプルがリストになるので戻す（AddonRecord がタプル化・intern する）
+            # 古いキャッシュには文字列のバージョンが残っていることがあるので整数タプルに揃える
+            addon['version'] = version_tuple(addon.get('version'))
+            addon['blender_version'] = version_tuple(addon.get('blender_version'))
+            return AddonRecord(addon)
+        
+        folders = {str(folder) for folder in self.addon_folders}
+        addons = [restore(addon) for addon in data.get('addons', []) if addon.get('folder_path') in folders]
+        metadata = {path: (mtime_ns, size, restore(addon_info))
+                    for path, (mtime_ns, size, addon_info) in data.get('metadata', {}).items()}
+        with self._metadata_lock:
+            for path, entry in metadata.items():
+                self._metadata_cache.setdefault(path, entry)
+        with self._size_lock:
+            for path, entry in data.get('sizes', {}).items():
+                # 旧形式（トップのmtimeだけ）の項目は信用せず計算し直す
+                if len(entry) == 3:
+                    self._size_cache.setdefault(path, tuple(entry))
+        self._set_local_addons(addons)
+        return bool(addons)
+    
+    def revalidate_local_addons(self):
+        """復元したインベントリを裏で再検証（statで変更を確認し、変わった情報ファイルだけ読み直す）"""
+        def worker():
+            try:
+                with self._scan_lock:
+                    addons = list(self.iter_local_addons())
+            except Exception as e:
+                print(f"インベントリ再検証エラー: {e}")
+                return
+            self.root.after(0, lambda: self._apply_revalidated(addons))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _apply_revalidated(self, addons):
+        """再検証結果を反映（変更があった場合のみ再表示）"""
+        def signature(records):
+            return [(addon['file_path'], addon.get('modified_date'), addon.get('version')) for addon in records]
+        
+        changed = signature(addons) != signature(self.local_addons)
+        if changed:
+            self._set_local_addons(addons)
+            self.display_local_addons()
+        self.save_inventory_cache()
+    
+    def iter_local_addons(self, folders=None, use_cache=True):
+        """アドオン情報を見つけた順に1件ずつ返すジェネレータ
+
+        use_cache=False の場合は情報キャッシュに溜めない（大量エクスポート用）
+        """
+        for folder in (self.addon_folders if folders is None else folders):
+            try:
+                if not os.path.isdir(folder):
+                    continue
+                
+                # .git や __pycache__ などの除外パターンは探索時に適用
+                for path, kind, depth, info_path, stat_result in walk_addon_candidates(
+                        folder, self.scan_max_depth, self.exclude_matcher):
+                    item = Path(path)
+                    # 単体.pyファイル / __init__.py / blender_manifest.toml
+                    addon_info = self.extract_addon_info(Path(info_path), stat_result, use_cache)
+                    
+                    if addon_info:
+                        addon_info['folder_path'] = str(folder)
+                        addon_info['file_path'] = str(item)
+                        addon_info['type'] = kind
+                        if kind == 'folder':
+                            # フォルダ全体のサイズは表示時にバックグラウンドで計算
+                            addon_info['file_size'] = None
+                        yield addon_info
+                        
+            except Exception as e:
+                print(f"フォルダスキャンエラー: {folder} - {e}")
+    
+    def export_inventory(self, output_path, fmt=None, folders=None, with_sizes=False):
+        """スキャン結果をストリーミングでファイルに書き出す（件数を返す）"""
+        fmt = fmt or export_format_from_path(output_path)
+        records = self.iter_local_addons(folders, use_cache=False)
+        if with_sizes:
+            records = self._with_folder_sizes(records)
+        with InventoryWriter(output_path, fmt) as writer:
+            for addon in records:
+                writer.write(addon)
+            return writer.count
+    
+    def _with_folder_sizes(self, records):
+        """フォルダ型アドオンのサイズを計算しながら流す"""
+        for addon in records:
+            if addon['type'] == 'folder':
+                addon['file_size'] = compute_tree_size(addon['file_path'])
+            yield addon
+    
+    def build_snapshot_records(self, addons=None, with_hashes=True):
+        """スナップショット用のレコード（key・内容ハッシュ付き）を作成"""
+        prune_hashes = addons is None
+        if addons is None:
+            addons = self.ensure_local_addons()
+        hashes = self.hash_addons(addons, prune=prune_hashes) if with_hashes else {}
+        records = {}
+        for addon in addons:
+            record = addon_to_record(addon)
+            key = snapshot_key(addon)
+            # 同名のカスタムフォルダなどでキーが重なったら番号を付けて区別する
+            unique_key, number = key, 2
+            while unique_key in records:
+                unique_key = f"{key}#{number}"
+                number += 1
+            record['key'] = unique_key
+            if addon['file_path'] in hashes:
+                record['content_hash'], record['file_size'] = hashes[addon['file_path']]
+            records[unique_key] = record
+        return records
+    
+    def save_snapshot(self, path, addons=None):
+        """現在のインベントリをスナップショットとして保存"""
+        records = self.build_snapshot_records(addons)
+        return write_snapshot(path, records.values())
+    
+    def diff_with_snapshot(self, path):
+        """保存済みスナップショットと現在のインベントリを比較"""
+        header, old_records = load_snapshot(path)
+        new_records = self.build_snapshot_records()
+        old_label = f"{header.get('host', '?')} {header.get('created', '')}"
+        return format_snapshot_diff(diff_snapshots(old_records, new_records), old_label, "現在")
+    
+    def save_snapshot_dialog(self):
+        """保存先を選んでスナップショットを保存"""
+        path = filedialog.asksaveasfilename(
+            title=self.get_text('save_snapshot'),
+            defaultextension=".jsonl",
+            initialfile=f"addons_{platform.node()}_{datetime.now().strftime('%Y%m%d')}.jsonl",
+            filetypes=[("Snapshot", "*.jsonl")]
+        )
+        if not path:
+            return
+        self.status_var.set(self.get_text('saving_snapshot'))
+        
+        def worker():
+            try:
+                count = self.save_snapshot(path)
+                self.root.after(0, lambda: self.status_var.set(f"📸 {count}件 → {path}"))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"スナップショット保存に失敗しました: {e}"))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def compare_snapshot_dialog(self):
+        """スナップショットを選んで現在のインベントリと比較"""
+        path = filedialog.askopenfilename(
+            title=self.get_text('compare_snapshot'),
+            filetypes=[("Snapshot", "*.jsonl"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        self.status_var.set(self.get_text('comparing_snapshot'))
+        
+        def worker():
+            try:
+                report = self.diff_with_snapshot(path)
+                self.root.after(0, lambda: self._show_tool_report('compare_snapshot', report))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"スナップショット比較に失敗しました: {e}"))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _parse_addon_imports(self, addons, max_workers=None, prune=False):
+        """各アドオンの .py を ast で解析（未変更ファイルはキャッシュ、残りはプロセスプールで並列に）
+
+        prune=True なら今回見つからなかったファイルをキャッシュから消す（全アドオンを解析したとき）。
+        戻り値: {file_path: (import名の集合, エラーのリスト)}
+        """
+        try:
+            with open(self.import_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        
+        files = {}
+        to_parse = []
+        for addon in addons:
+            paths = []
+            for rel_path, path, stat_result in iter_addon_files(addon['file_path']):
+                if not path.endswith('.py'):
+                    continue
+                paths.append(path)
+                cached = cache.get(path)
+                stamp = [stat_result.st_mtime_ns, stat_result.st_size]
+                if not cached or cached[:2] != stamp:
+                    cache[path] = stamp + [[], None]
+                    to_parse.append(path)
+            files[addon['file_path']] = paths
+        
+        if to_parse:
+            if len(to_parse) < IMPORT_PARSE_INLINE_LIMIT:
+                parsed = map(parse_import_names, to_parse)
+                for path, names, error in parsed:
+                    cache[path][2:] = [names, error]
+            else:
+                workers = max_workers or os.cpu_count() or 1
+                chunksize = max(1, len(to_parse) // (workers * 4))
+                # Tkや他のワーカースレッドが動いている中でforkするとロックを抱えたまま固まるのでspawnで起動
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context('spawn')) as executor:
+                    for path, names, error in executor.map(parse_import_names, to_parse, chunksize=chunksize):
+                        cache[path][2:] = [names, error]
+        
+        if prune:
+            seen = {path for paths in files.values() for path in paths}
+            stale = [path for path in cache if path not in seen]
+            for path in stale:
+                del cache[path]
+        else:
+            stale = []
+        
+        if to_parse or stale:
+            try:
+                with open(self.import_cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(cache, f, ensure_ascii=False)
+            except Exception as e:
+                print(f"import解析キャッシュ保存エラー: {e}")
+        
+        results = {}
+        for addon_path, paths in files.items():
+            names = set()
+            errors = []
+            for path in paths:
+                names.update(cache[path][2])
+                if cache[path][3]:
+                    errors.append(f"{path}: {cache[path][3]}")
+            results[addon_path] = (names, errors)
+        return results
+    
+    def analyze_addon_dependencies(self, addons=None, max_workers=None):
+        """アドオンごとのimportを 標準ライブラリ / Blender同梱 / 他のアドオン / 見つからない に分類
+
+        戻り値: {file_path: {'name', 'stdlib', 'bundled', 'addons', 'missing', 'errors'}}
+        'addons' は依存先アドオンの file_path（アドオン間の依存グラフの辺）。
+        """
+        analyze_all = addons is None
+        if analyze_all:
+            addons = self.ensure_local_addons()
+        modules = {}  # モジュール名 -> そのアドオンの file_path
+        for addon in self.local_addons or addons:
+            modules.setdefault(addon_module_name(addon), addon['file_path'])
+        stdlib = set(sys.stdlib_module_names) | set(sys.builtin_module_names)
+        
+        imports = self._parse_addon_imports(addons, max_workers, prune=analyze_all)
+        graph = {}
+        for addon in addons:
+            names, errors = imports[addon['file_path']]
+            internal = addon_internal_modules(addon)
+            entry = {'name': addon['name'], 'stdlib': [], 'bundled': [], 'addons': [], 'missing': [],
+                     'errors': errors}
+            for name in sorted(names - internal):
+                if name in stdlib:
+                    entry['stdlib'].append(name)
+                elif name in BLENDER_BUNDLED_MODULES:
+                    entry['bundled'].append(name)
+                elif name in modules:
+                    entry['addons'].append(modules[name])
+                else:
+                    entry['missing'].append(name)
+            graph[addon['file_path']] = entry
+        return graph
+    
+    def _format_dependency_report(self, graph):
+        """依存関係解析の結果を文字列に整形"""
+        names = {path: entry['name'] for path, entry in graph.items()}
+        missing = [(path, entry) for path, entry in graph.items() if entry['missing']]
+        linked = [(path, entry) for path, entry in graph.items() if entry['addons']]
+        lines = [f"📦 {len(graph)}個のアドオンを解析しました", ""]
+        
+        lines.append(f"❓ Blender同梱のPythonに無いモジュールを使うアドオン: {len(missing)}件")
+        for path, entry in sorted(missing, key=lambda item: item[1]['name'].lower()):
+            lines.append(f"   {entry['name']}: {', '.join(entry['missing'])}")
+            lines.append(f"      📍 {path}")
+        lines.append("")
+        
+        lines.append(f"🔗 他のアドオンに依存するアドオン: {len(linked)}件")
+        for path, entry in sorted(linked, key=lambda item: item[1]['name'].lower()):
+            targets = [names.get(target, os.path.basename(target)) for target in entry['addons']]
+            lines.append(f"   {entry['name']} → {', '.join(targets)}")
+        lines.append("")
+        
+        # サードパーティ（numpy など）ごとの利用アドオン
+        users = {}
+        for entry in graph.values():
+            for name in entry['bundled'] + entry['missing']:
+                if name not in BLENDER_API_MODULES:
+                    users.setdefault(name, []).append(entry['name'])
+        lines.append("📚 モジュール別の利用アドオン（bpy系を除く）")
+        for name in sorted(users, key=lambda n: (-len(users[n]), n)):
+            lines.append(f"   {name} ({len(users[name])}): {', '.join(sorted(users[name])[:10])}"
+                         + (" ..." if len(users[name]) > 10 else ""))
         
-        # Blender標準パス（Windows）
-        user_home = Path.home()
-        blender_path = user_home / "AppData" / "Roaming" / "Blender Foundation" / "Blender"
+        errors = [error for entry in graph.values() for error in entry['errors']]
+        if errors:
+            lines.append("")
+            lines.append(f"⚠️ 解析できなかったファイル: {len(errors)}件")
+            lines.extend(f"   {error}" for error in errors[:50])
+        return "\n".join(lines)
+    
+    def show_dependency_analysis(self):
+        """依存関係解析をバックグラウンドで実行して結果を表示"""
+        self.status_var.set(self.get_text('analyzing_dependencies'))
         
-        # バージョン別フォルダを検索
-        if blender_path.exists():
-            for version_folder in blender_path.iterdir():
-                if version_folder.is_dir() and version_folder.name.replace('.', '').isdigit():
-                    addon_folder = version_folder / "scripts" / "addons"
-                    if addon_folder.exists():
-                        folders.append(str(addon_folder))
+        def worker():
+            try:
+                report = self._format_dependency_report(self.analyze_addon_dependencies())
+                self.root.after(0, lambda: self._show_tool_report('analyze_dependencies', report))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"依存関係の解析に失敗しました: {e}"))
         
-        # 追加: カスタムフォルダ（後で設定機能追加予定）
-        return folders
+        threading.Thread(target=worker, daemon=True).start()
     
-    def extract_addon_info(self, file_path):
-        """Pythonファイルからbl_info情報を抽出"""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+    def export_compat_matrix(self, path, extra_versions=(), fmt=None):
+        """互換性マトリクスを書き出す（未スキャンならスキャンする）"""
+        self.ensure_local_addons()
+        return write_compat_matrix(self.compat_matrix, path, extra_versions, fmt)
+    
+    def _format_compat_report(self):
+        """互換性マトリクスの集計と、動かない可能性があるアドオンの一覧"""
+        matrix = self.compat_matrix
+        if not matrix.versions:
+            return "インストール済みのBlenderバージョンが見つかりません"
+        labels = [".".join(map(str, version)) for version in matrix.versions]
+        lines = [f"🧮 {len(matrix.rows)}個のアドオン × Blender {', '.join(labels)}", ""]
+        for label, (version, counts) in zip(labels, matrix.summary().items()):
+            lines.append(f"Blender {label}: " + "  ".join(
+                f"{COMPAT_LABELS[status]} {counts[status]}" for status in COMPAT_STATUSES))
         
-            # bl_info辞書を正規表現で抽出
-            bl_info_pattern = r'bl_info\s*=\s*{([^}]+)}'
-            match = re.search(bl_info_pattern, content, re.DOTALL)
+        too_new = [row for row in matrix.rows.values() if 'too_new' in row['status'].values()]
+        if too_new:
+            lines.append("")
+            lines.append(f"⛔ 一部のバージョンで要求バージョンを満たさないアドオン: {len(too_new)}件")
+            for row in sorted(too_new, key=lambda row: row['key']):
+                cells = " ".join(f"{label}{COMPAT_LABELS[row['status'][version]]}"
+                                 for label, version in zip(labels, matrix.versions))
+                lines.append(f"   {row['key']}  {row['name']} (要求 {'.'.join(map(str, row['required']))}+)  {cells}")
         
-            if match:
-                bl_info_str = '{' + match.group(1) + '}'
-                try:
-                    # 安全な評価（基本的な辞書のみ）
-                    bl_info = eval(bl_info_str)
-                
-                    addon_info = {
-                        'name': bl_info.get('name', file_path.stem),
-                        'version': bl_info.get('version', (0, 0, 0)),
-                        'description': bl_info.get('description', '説明なし'),
-                        'author': bl_info.get('author', '不明'),
-                        'category': bl_info.get('category', 'その他'),
-                        'blender_version': bl_info.get('blender', (0, 0, 0)),
-                        'file_size': file_path.stat().st_size,
-                        'modified_date': file_path.stat().st_mtime
-                    }
-                    return addon_info
-                except:
-                    pass
-        
-            # bl_infoが見つからない場合のフォールバック
-            return {
-                'name': file_path.stem,
-                'version': (0, 0, 0),
-                'description': 'bl_info情報が見つかりません',
-                'author': '不明',
-                'category': 'その他',
-                'blender_version': (0, 0, 0),
-                'file_size': file_path.stat().st_size,
-                'modified_date': file_path.stat().st_mtime
-            }
+        unknown = [row for row in matrix.rows.values() if row['required'] is None]
+        if unknown:
+            lines.append("")
+            lines.append(f"❔ 対応バージョン不明: {len(unknown)}件")
+            lines.extend(f"   {row['key']}  {row['name']}" for row in sorted(unknown, key=lambda row: row['key']))
+        return "\n".join(lines)
+    
+    def show_compat_matrix(self):
+        """互換性マトリクスを表示（未スキャンならバックグラウンドでスキャン）"""
+        if self.local_addons:
+            self._show_tool_report('compat_matrix', self._format_compat_report())
+            return
+        self.status_var.set(self.get_text('scanning'))
+        
+        def worker():
+            try:
+                # 反映（互換性マトリクスの構築）はTkスレッドで先に実行される
+                self.ensure_local_addons()
+                self.root.after(0, lambda: self._show_tool_report('compat_matrix', self._format_compat_report()))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"互換性の確認に失敗しました: {e}"))
         
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def export_compat_matrix_dialog(self):
+        """保存先を選んで互換性マトリクスを書き出す"""
+        path = filedialog.asksaveasfilename(
+            title=self.get_text('export_compat_matrix'),
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")]
+        )
+        if not path:
+            return
+        try:
+            count = self.export_compat_matrix(path)
+            self.status_var.set(f"📤 {count}件 → {path}")
         except Exception as e:
-            print(f"ファイル読み込みエラー: {file_path} - {e}")
-            return None
-
-    def scan_local_addons(self):
-        """ローカルアドオンをスキャン"""
-        self.local_addons = []
+            messagebox.showerror("エラー", f"エクスポートに失敗しました: {e}")
+    
+    def _show_tool_report(self, title_key, report):
+        """ツールの実行結果を表示（UIスレッド）"""
+        self.status_var.set(self.get_text('ready'))
+        self._show_scrollable_info(self.get_text(title_key), report)
+    
+    def export_inventory_dialog(self):
+        """保存先を選んでインベントリをエクスポート"""
+        filetypes = [("JSON Lines", "*.jsonl"), ("CSV", "*.csv")]
+        if pq is not None:
+            filetypes.append(("Parquet", "*.parquet"))
+        output_path = filedialog.asksaveasfilename(
+            title=self.get_text('export'),
+            defaultextension=".jsonl",
+            filetypes=filetypes
+        )
+        if not output_path:
+            return
+        self.status_var.set(self.get_text('exporting'))
         
-        for folder in self.addon_folders:
+        def worker():
             try:
-                folder_path = Path(folder)
-                if not folder_path.exists():
-                    continue
-                    
-                # .pyファイルと__pycache__以外のフォルダをチェック
-                for item in folder_path.iterdir():
-                    addon_info = None
-                    
-                    if item.is_file() and item.suffix == '.py':
-                        # 単体.pyファイルアドオン
-                        addon_info = self.extract_addon_info(item)
-                    elif item.is_dir() and item.name != '__pycache__':
-                        # フォルダ型アドオン
-                        init_file = item / "__init__.py"
-                        if init_file.exists():
-                            addon_info = self.extract_addon_info(init_file)
-                    
-                    if addon_info:
-                        addon_info['folder_path'] = str(folder)
-                        addon_info['file_path'] = str(item)
-                        addon_info['type'] = 'file' if item.is_file() else 'folder'
-                        self.local_addons.append(addon_info)
-                        
+                count = self.export_inventory(output_path)
+                self.root.after(0, lambda: self.status_var.set(f"📤 {count}件 → {output_path}"))
             except Exception as e:
-                print(f"フォルダスキャンエラー: {folder} - {e}")
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"エクスポートに失敗しました: {e}"))
         
-        return self.local_addons
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def scan_single_addon(self, path, folder):
+        """1つのアドオンだけを読み込む（操作後の部分更新用）"""
+        if os.path.isfile(path):
+            if not path.endswith('.py'):
+                return None
+            kind, info_path = 'file', path
+        else:
+            kind = 'folder'
+            info_path = os.path.join(path, MANIFEST_FILENAME)
+            if not os.path.exists(info_path):
+                info_path = os.path.join(path, '__init__.py')
+                if not os.path.exists(info_path):
+                    return None
+        
+        addon_info = self.extract_addon_info(Path(info_path))
+        if addon_info:
+            addon_info['folder_path'] = str(folder)
+            addon_info['file_path'] = str(path)
+            addon_info['type'] = kind
+            if kind == 'folder':
+                addon_info['file_size'] = None
+        return addon_info
+    
+    def get_cached_folder_size(self, folder_path, modified_date=None):
+        """キャッシュ済みのフォルダサイズ（アドオンの更新日時が変わっていればNone）
+
+        statしないので表示中にそのまま使える。サブフォルダの変化は compute_folder_size の再検証で拾う。
+        """
+        with self._size_lock:
+            cached = self._size_cache.get(folder_path)
+        if cached and cached[1] == modified_date:
+            return cached[2]
+        return None
+    
+    def compute_folder_size(self, folder_path, modified_date=None, revalidate=False):
+        """フォルダサイズを計算してキャッシュ
+
+        revalidate=True なら、キャッシュ時からどのフォルダのmtimeも変わっていなければ計算を省く。
+        """
+        if not os.path.isdir(folder_path):
+            return None
+        if revalidate:
+            with self._size_lock:
+                cached = self._size_cache.get(folder_path)
+            if (cached and cached[1] == modified_date
+                    and cached[0] == tree_size_and_dir_mtime(folder_path, with_sizes=False)[1]):
+                return cached[2]
+        size, dir_mtime_ns = tree_size_and_dir_mtime(folder_path)
+        with self._size_lock:
+            self._size_cache[folder_path] = (dir_mtime_ns, modified_date, size)
+        return size
+    
+    def _schedule_size_computation(self, pending, generation):
+        """表示中のフォルダ型アドオンのサイズをバックグラウンドで計算"""
+        def worker():
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {
+                    executor.submit(self.compute_folder_size, addon['file_path'],
+                                    addon.get('modified_date'), True): (index, addon)
+                    for index, addon in pending
+                }
+                # 計算が終わった順に表示する（大きなフォルダが後続を待たせないように）
+                for future in as_completed(futures):
+                    index, addon = futures[future]
+                    size = future.result()
+                    if size is None or size == addon.get('file_size'):
+                        continue
+                    self.root.after(0, lambda i=index, a=addon, sz=size:
+                                    self._update_displayed_size(i, a, sz, generation))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _update_displayed_size(self, index, addon, size, generation):
+        """計算済みサイズで表示を差し替え（再表示後の古い結果は無視）"""
+        addon['file_size'] = size
+        if generation != self._local_render_generation:
+            return
+        size_tag = f"size_{index}"
+        ranges = self.local_text.tag_ranges(size_tag)
+        if ranges:
+            self.local_text.delete(ranges[0], ranges[1])
+            self.local_text.insert(ranges[0], self._format_size(addon), ("addon_info", size_tag))
+    
+    def _format_size(self, addon):
+        """サイズ表示用文字列"""
+        if addon.get('file_size') is None:
+            return "計算中..."
+        return f"{addon['file_size'] / (1024 * 1024):.2f} MB"
+    
+    def set_scan_options(self, max_depth=None, exclude_patterns=None):
+        """探索の深さ制限と除外パターンを変更"""
+        if max_depth is not None:
+            self.scan_max_depth = max(0, int(max_depth))
+        if exclude_patterns is not None:
+            self.exclude_patterns = list(exclude_patterns)
+            self.exclude_matcher = ExcludeMatcher(self.exclude_patterns)
     
     def load_language_texts(self):
         """言語テキストの定義（ローカルアドオン関連追加）"""
@@ -182,6 +2776,7 @@ class BlenderStyleSearchTool:
                 "github_stars": "GitHub (⭐{})",
                 "web_result": "Web検索結果",
                 "local_db": "ローカルデータベース",
+                "catalog_result": "エクステンションカタログ（オフライン）",
                 "error_source": "エラー",
                 "usage_guide": " 📖 使い方ガイド ",
                 "bookmarks": " 📌 ブックマーク ",
@@ -190,6 +2785,13 @@ class BlenderStyleSearchTool:
                 "refresh": "🔄 更新",
                 "delete": "🗑️ 削除",
                 "open": "🌐 開く",
+                "check_links": "🔗 リンク確認",
+                "import_bookmarks": "📥 インポート",
+                "export_bookmarks": "📤 エクスポート",
+                "importing_bookmarks": "📥 ブックマークを読み込み中...",
+                "bookmarks_imported": "📥 {}件追加しました（重複 {}件）",
+                "checking_links": "🔗 リンク確認中...",
+                "link_check_done": "🔗 {}件確認しました（リンク切れ・転送 {}件）",
                 "scan": "🔄 スキャン",
                 "add_folder": "📁 フォルダ追加",
                 "open_folder": "📁 フォルダを開く",
@@ -214,7 +2816,46 @@ class BlenderStyleSearchTool:
                 "url_missing": "URLを入力してください",
                 "recommend_text": "初心者におすすめ:\n• Node Wrangler\n• Extra Objects\n• LoopTools\n\n定期的に新しいアドオンをチェックしよう！",
                 "help_text": "\n🔍 Blender アドオン検索ツール v2.2\n\n【NEW！】ローカルアドオン管理機能\n• 📂 私のアドオン: PCに保存されたアドオンを一覧表示\n• 🔄 自動スキャン: Blenderアドオンフォルダを自動検出\n• 📁 フォルダ管理: カスタムフォルダの追加・管理（外付けハードディスクのパスも追加可能！）\n\n【検索機能】Google検索対応！\n• GitHub API: 公式アドオン検索\n• Google検索: ブログ・解説記事・チュートリアル\n• ブックマーク: 有用な情報を簡単保存\n\n【使い方】\n1. 検索したいキーワードを入力\n2. 検索モードを選択  \n3. 検索ボタンをクリック\n4. 「📂 私のアドオン」でローカル管理\n\n【検索モード】\n• 全検索: GitHub + Web + ローカル\n• Web検索: GitHub + Google検索\n• ローカルのみ: サンプルデータのみ\n\n作成者: シットさん\nバージョン: 2.2 Local Library Edition\n                ",
-                "history_coming": "履歴機能は実装中です"
+                "history_coming": "履歴機能は実装中です",
+                "profile": "🔬 プロファイル",
+                "duplicates": "🧬 重複チェック",
+                "checking_duplicates": "重複チェック中...",
+                "check_updates": "⬆️ 更新チェック",
+                "checking_updates": "更新チェック中...",
+                "move_to_trash": "ゴミ箱へ",
+                "copy_to_version": "別バージョンへコピー",
+                "install": "📥 インストール",
+                "cancel_operations": "⏹ 中止",
+                "cancelled": "中止しました",
+                "choose_folder": "コピー先のアドオンフォルダを選択",
+                "zip_index": "🗜️ ZIP解析",
+                "indexing_zips": "ZIPを解析中...",
+                "export": "📤 エクスポート",
+                "exporting": "エクスポート中...",
+                "tools": "🧰 ツール",
+                "save_snapshot": "📸 スナップショット保存",
+                "compare_snapshot": "🔍 スナップショットと比較",
+                "saving_snapshot": "スナップショット保存中...",
+                "comparing_snapshot": "スナップショット比較中...",
+                "analyze_dependencies": "🧩 import依存関係の解析",
+                "analyzing_dependencies": "import依存関係を解析中...",
+                "compat_matrix": "🧮 Blenderバージョン互換性",
+                "export_compat_matrix": "📤 互換性マトリクスを書き出し",
+                "facet_category": "カテゴリ",
+                "facet_author": "作者",
+                "facet_blender_version": "Blender",
+                "facet_type": "タイプ",
+                "facet_folder": "フォルダ",
+                "facet_all": "すべて",
+                "clear_filters": "✖ 解除",
+                "sort_by": "並べ替え",
+                "sort_default": "スキャン順",
+                "sort_name": "名前",
+                "sort_version": "バージョン",
+                "sort_file_size": "サイズ",
+                "sort_modified_date": "更新日時",
+                "sort_blender_version": "対応Blender",
+                "show_more": "さらに表示（残り {} 件）"
             },
             "en": {
                 "title": "🔍 Blender Addon Search Tool",
@@ -248,6 +2889,7 @@ class BlenderStyleSearchTool:
                 "github_stars": "GitHub (⭐{})",
                 "web_result": "Web Search Result",
                 "local_db": "Local Database",
+                "catalog_result": "Extensions Catalog (offline)",
                 "error_source": "Error",
                 "usage_guide": " 📖 Usage Guide ",
                 "bookmarks": " 📌 Bookmarks ",
@@ -256,6 +2898,13 @@ class BlenderStyleSearchTool:
                 "refresh": "🔄 Refresh",
                 "delete": "🗑️ Delete",
                 "open": "🌐 Open",
+                "check_links": "🔗 Check Links",
+                "import_bookmarks": "📥 Import",
+                "export_bookmarks": "📤 Export",
+                "importing_bookmarks": "📥 Importing bookmarks...",
+                "bookmarks_imported": "📥 Added {} bookmarks ({} duplicates)",
+                "checking_links": "🔗 Checking links...",
+                "link_check_done": "🔗 Checked {} links ({} dead or redirected)",
                 "scan": "🔄 Scan",
                 "add_folder": "📁 Add Folder",
                 "open_folder": "📁 Open Folder",
@@ -280,7 +2929,46 @@ class BlenderStyleSearchTool:
                 "url_missing": "Please enter a URL",
                 "recommend_text": "Recommended for beginners:\n• Node Wrangler\n• Extra Objects\n• LoopTools\n\nCheck for new addons regularly!",
                 "help_text": "\n🔍 Blender Addon Search Tool v2.2\n\n【NEW!】Local Addon Management\n• 📂 My Addons: View local addons list\n• 🔄 Auto Scan: Auto-detect Blender addon folders\n• 📁 Folder Manager: Add & manage custom folders (External HDD paths can also be added!)\n\n【Search Feature】Google Search Support!\n• GitHub API: Official addon search\n• Google Search: Blogs, tutorials, guides\n• Bookmarks: Easy saving of useful info\n\n【How to Use】\n1. Enter search keywords\n2. Select search mode\n3. Click search button\n4. Use \"📂 My Addons\" for local management\n\n【Search Modes】\n• All Search: GitHub + Web + Local\n• Web Search: GitHub + Google Search\n• Local Only: Sample data only\n\nCreator: sitst\nVersion: 2.2 Local Library Edition\n                ",
-                "history_coming": "History feature is under development"
+                "history_coming": "History feature is under development",
+                "profile": "🔬 Profile",
+                "duplicates": "🧬 Find Duplicates",
+                "checking_duplicates": "Checking duplicates...",
+                "check_updates": "⬆️ Check Updates",
+                "checking_updates": "Checking for updates...",
+                "move_to_trash": "Trash",
+                "copy_to_version": "Copy to Version",
+                "install": "📥 Install",
+                "cancel_operations": "⏹ Cancel",
+                "cancelled": "Cancelled",
+                "choose_folder": "Choose target addon folder",
+                "zip_index": "🗜️ Inspect ZIPs",
+                "indexing_zips": "Inspecting ZIP archives...",
+                "export": "📤 Export",
+                "exporting": "Exporting...",
+                "tools": "🧰 Tools",
+                "save_snapshot": "📸 Save Snapshot",
+                "compare_snapshot": "🔍 Compare with Snapshot",
+                "saving_snapshot": "Saving snapshot...",
+                "comparing_snapshot": "Comparing snapshot...",
+                "analyze_dependencies": "🧩 Analyze Import Dependencies",
+                "analyzing_dependencies": "Analyzing import dependencies...",
+                "compat_matrix": "🧮 Blender Version Compatibility",
+                "export_compat_matrix": "📤 Export Compatibility Matrix",
+                "facet_category": "Category",
+                "facet_author": "Author",
+                "facet_blender_version": "Blender",
+                "facet_type": "Type",
+                "facet_folder": "Folder",
+                "facet_all": "All",
+                "clear_filters": "✖ Clear",
+                "sort_by": "Sort",
+                "sort_default": "Scan order",
+                "sort_name": "Name",
+                "sort_version": "Version",
+                "sort_file_size": "Size",
+                "sort_modified_date": "Modified",
+                "sort_blender_version": "Blender",
+                "show_more": "Show more ({} remaining)"
             }
         }
         
@@ -560,7 +3248,27 @@ class BlenderStyleSearchTool:
             bd=5
         )
         self.search_entry.pack(fill='x', pady=(5, 0))
-        self.search_entry.bind('<Return>', lambda e: self.search())
+        self.search_entry.bind('<Return>', self.on_search_return)
+        self.search_entry.bind('<KeyRelease>', self.on_search_key)
+        self.search_entry.bind('<Down>', self.focus_suggestions)
+        self.search_entry.bind('<Escape>', lambda e: self.hide_suggestions())
+        self.search_entry.bind('<FocusOut>', lambda e: self.root.after(150, self._hide_suggestions_unless_focused))
+        
+        # 入力候補（検索欄の直下に重ねて表示）
+        self.suggestion_listbox = tk.Listbox(
+            input_frame,
+            font=("Segoe UI", 10),
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            selectbackground=self.colors['accent_blue'],
+            relief='flat',
+            height=AUTOCOMPLETE_TOP_K,
+            activestyle='none'
+        )
+        self.suggestion_listbox.bind('<Return>', self.accept_suggestion)
+        self.suggestion_listbox.bind('<ButtonRelease-1>', self.accept_suggestion)
+        self.suggestion_listbox.bind('<Escape>', lambda e: (self.hide_suggestions(), self.search_entry.focus_set()))
+        self.suggestion_listbox.bind('<FocusOut>', lambda e: self.root.after(150, self._hide_suggestions_unless_focused))
         
         # 検索モード選択
         mode_frame = tk.Frame(search_frame, bg=self.colors['bg_medium'])
@@ -731,6 +3439,171 @@ class BlenderStyleSearchTool:
         )
         add_folder_btn.pack(side='left', padx=(0, 5))
         
+        duplicates_btn = tk.Button(
+            local_toolbar,
+            text=self.get_text('duplicates'),
+            command=self.show_duplicate_addons,
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            font=('Segoe UI', 9),
+            relief='flat',
+            padx=10,
+            pady=5
+        )
+        duplicates_btn.pack(side='left', padx=(0, 5))
+        
+        updates_btn = tk.Button(
+            local_toolbar,
+            text=self.get_text('check_updates'),
+            command=self.show_update_check,
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            font=('Segoe UI', 9),
+            relief='flat',
+            padx=10,
+            pady=5
+        )
+        updates_btn.pack(side='left', padx=(0, 5))
+        
+        install_btn = tk.Button(
+            local_toolbar,
+            text=self.get_text('install'),
+            command=self.install_addon,
+            bg=self.colors['accent_blue'],
+            fg='white',
+            font=('Segoe UI', 9),
+            relief='flat',
+            padx=10,
+            pady=5
+        )
+        install_btn.pack(side='left', padx=(0, 5))
+        
+        zip_btn = tk.Button(
+            local_toolbar,
+            text=self.get_text('zip_index'),
+            command=self.show_zip_index,
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            font=('Segoe UI', 9),
+            relief='flat',
+            padx=10,
+            pady=5
+        )
+        zip_btn.pack(side='left', padx=(0, 5))
+        
+        export_btn = tk.Button(
+            local_toolbar,
+            text=self.get_text('export'),
+            command=self.export_inventory_dialog,
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            font=('Segoe UI', 9),
+            relief='flat',
+            padx=10,
+            pady=5
+        )
+        export_btn.pack(side='left', padx=(0, 5))
+        
+        # その他のツール（メニュー）
+        tools_btn = tk.Menubutton(
+            local_toolbar,
+            text=self.get_text('tools'),
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            activebackground=self.colors['accent_blue'],
+            font=('Segoe UI', 9),
+            relief='flat',
+            padx=10,
+            pady=5
+        )
+        self.tools_menu = tk.Menu(
+            tools_btn,
+            tearoff=0,
+            bg=self.colors['bg_medium'],
+            fg=self.colors['text_white'],
+            activebackground=self.colors['accent_blue']
+        )
+        self.tools_menu.add_command(label=self.get_text('save_snapshot'), command=self.save_snapshot_dialog)
+        self.tools_menu.add_command(label=self.get_text('compare_snapshot'), command=self.compare_snapshot_dialog)
+        self.tools_menu.add_command(label=self.get_text('analyze_dependencies'), command=self.show_dependency_analysis)
+        self.tools_menu.add_separator()
+        self.tools_menu.add_command(label=self.get_text('compat_matrix'), command=self.show_compat_matrix)
+        self.tools_menu.add_command(label=self.get_text('export_compat_matrix'), command=self.export_compat_matrix_dialog)
+        tools_btn.config(menu=self.tools_menu)
+        tools_btn.pack(side='left', padx=(0, 5))
+        
+        cancel_btn = tk.Button(
+            local_toolbar,
+            text=self.get_text('cancel_operations'),
+            command=self.cancel_operations,
+            bg=self.colors['orange'],
+            fg='white',
+            font=('Segoe UI', 9),
+            relief='flat',
+            padx=10,
+            pady=5
+        )
+        cancel_btn.pack(side='right')
+        
+        # ファセット絞り込みバー
+        filter_bar = tk.Frame(self.local_addon_frame, bg=self.colors['bg_medium'])
+        filter_bar.pack(fill='x', pady=(8, 0), padx=15)
+        self.facet_combos = {}
+        self._facet_choices = {}
+        for field in FACET_FIELDS:
+            tk.Label(
+                filter_bar,
+                text=self.get_text(f'facet_{field}'),
+                font=('Segoe UI', 8),
+                bg=self.colors['bg_medium'],
+                fg=self.colors['text_gray']
+            ).pack(side='left', padx=(0, 2))
+            combo = ttk.Combobox(filter_bar, state='readonly', width=14, font=('Segoe UI', 8))
+            combo.pack(side='left', padx=(0, 8))
+            combo.bind('<<ComboboxSelected>>', lambda e, f=field: self.on_facet_selected(f))
+            self.facet_combos[field] = combo
+        
+        clear_filter_btn = tk.Button(
+            filter_bar,
+            text=self.get_text('clear_filters'),
+            command=self.clear_facet_filters,
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            font=('Segoe UI', 8),
+            relief='flat',
+            padx=6
+        )
+        clear_filter_btn.pack(side='left')
+        
+        # 並べ替え
+        self.sort_order_btn = tk.Button(
+            filter_bar,
+            text="▼" if self.sort_descending else "▲",
+            command=self.toggle_sort_order,
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            font=('Segoe UI', 8),
+            relief='flat',
+            padx=6
+        )
+        self.sort_order_btn.pack(side='right')
+        self._sort_choices = {self.get_text('sort_default'): None}
+        for field in SORT_FIELDS:
+            self._sort_choices[self.get_text(f'sort_{field}')] = field
+        self.sort_combo = ttk.Combobox(filter_bar, state='readonly', width=12, font=('Segoe UI', 8),
+                                       values=list(self._sort_choices))
+        self.sort_combo.set(next(label for label, field in self._sort_choices.items()
+                                 if field == self.sort_field))
+        self.sort_combo.bind('<<ComboboxSelected>>', self.on_sort_selected)
+        self.sort_combo.pack(side='right', padx=(0, 4))
+        tk.Label(
+            filter_bar,
+            text=self.get_text('sort_by'),
+            font=('Segoe UI', 8),
+            bg=self.colors['bg_medium'],
+            fg=self.colors['text_gray']
+        ).pack(side='right', padx=(0, 2))
+        
         # ローカルアドオンリスト表示エリア
         self.local_text = scrolledtext.ScrolledText(
             self.local_addon_frame,
@@ -750,16 +3623,37 @@ class BlenderStyleSearchTool:
         self.local_text.tag_configure("addon_action", foreground=self.colors['orange'], underline=True)
     
     def scan_and_display_local_addons(self):
-        """ローカルアドオンをスキャンして表示"""
+        """ローカルアドオンをスキャンして表示（プロファイル有効時は計測付き）"""
+        return self.run_profiled("scan", self._scan_and_display_local_addons)
+    
+    def _scan_and_display_local_addons(self):
+        """ローカルアドオンをスキャンして表示（本体）"""
         self.local_text.delete(1.0, tk.END)
         self.local_text.insert(tk.END, f"🔄 {self.get_text('scanning')}\n\n")
         self.local_text.update()
         
         try:
-            addons = self.scan_local_addons()
-            
+            # 明示的なスキャン時はルートも再検出する
+            self.refresh_addon_folders()
+            self.scan_local_addons()
+            self.display_local_addons()
+        
+        except Exception as e:
+            self.local_text.delete(1.0, tk.END)
+            self.local_text.insert(tk.END, f"❌ エラーが発生しました: {e}\n")
+    
+    def display_local_addons(self):
+        """メモリ上のアドオン一覧を表示（再スキャンはしない、ファセット条件を適用）"""
+        self.refresh_facet_filters()
+        filtered = any(value is not None for value in self.facet_filters.values())
+        addons = self.facet_index.query(self.facet_filters) if filtered else self.local_addons
+        try:
             self.local_text.delete(1.0, tk.END)
             
+            if filtered and not addons:
+                self.local_text.insert(tk.END, f"❌ {self.get_text('no_addons_found')}\n")
+                return
+            
             if not addons:
                 self.local_text.insert(tk.END, f"❌ {self.get_text('no_addons_found')}\n\n")
                 self.local_text.insert(tk.END, "確認済みフォルダ:\n")
@@ -770,80 +3664,219 @@ class BlenderStyleSearchTool:
             self.local_text.insert(tk.END, f"✅ {self.get_text('found_addons').format(len(addons))}\n\n")
             self.local_text.insert(tk.END, "=" * 70 + "\n\n")
             
-            for i, addon in enumerate(addons, 1):
-                # アドオン基本情報
-                version_str = ".".join(map(str, addon['version']))
-                blender_ver = ".".join(map(str, addon['blender_version']))
-                size_mb = addon['file_size'] / (1024 * 1024)
-                
-                # 更新日時
-                try:
-                    mod_time = datetime.fromtimestamp(addon['modified_date'])
-                    mod_str = mod_time.strftime('%Y-%m-%d %H:%M')
-                except:
-                    mod_str = "不明"
-                
-                # アドオン名
-                self.local_text.insert(tk.END, f"🔧 {i}. {addon['name']}\n", "addon_header")
-                
-                # 基本情報
-                info_lines = [
-                    f"   📊 バージョン: {version_str}",
-                    f"   👤 作者: {addon['author']}",
-                    f"   📂 カテゴリ: {addon['category']}",
-                    f"   🎯 対応Blender: {blender_ver}+",
-                    f"   💾 サイズ: {size_mb:.2f} MB",
-                    f"   📅 更新: {mod_str}",
-                    f"   📄 タイプ: {'ファイル' if addon['type'] == 'file' else 'フォルダ'}"
-                ]
-                
-                for line in info_lines:
+            self._local_render_generation += 1
+            self._local_view = self.sort_addons(addons)
+            self._local_rendered = 0
+            self._render_local_page()
+        
+        except Exception as e:
+            self.local_text.delete(1.0, tk.END)
+            self.local_text.insert(tk.END, f"❌ エラーが発生しました: {e}\n")
+    
+    def _addon_view(self, addon):
+        """表示用文字列とソートキー（レコードごとに1回だけ作り、更新日時が変わるまで再利用）"""
+        cache_key = (addon['file_path'], addon.get('modified_date'))
+        view = self._view_cache.get(cache_key)
+        if view is not None:
+            return view
+        try:
+            mod_str = datetime.fromtimestamp(addon['modified_date']).strftime('%Y-%m-%d %H:%M')
+        except (TypeError, ValueError, OSError, OverflowError):
+            mod_str = "不明"
+        # 表示もソートキーも整数タプルから作る（文字列のバージョンが混ざっても比較できるように）
+        version = version_tuple(addon.get('version'))
+        blender_version = version_tuple(addon.get('blender_version'))
+        view = {
+            'version_str': ".".join(map(str, version)),
+            'blender_str': ".".join(map(str, blender_version)),
+            'mod_str': mod_str,
+            'type_str': 'ファイル' if addon['type'] == 'file' else 'フォルダ',
+            'description': (addon['description'][:100] + "..."
+                            if len(addon['description']) > 100 else addon['description']),
+            'keys': {
+                'name': (addon['name'].casefold(), addon['file_path']),
+                'version': version,
+                'modified_date': addon.get('modified_date') or 0,
+                'blender_version': blender_version,
+            },
+        }
+        self._view_cache[cache_key] = view
+        return view
+    
+    def sort_addons(self, addons, field=None, descending=None):
+        """キャッシュ済みのソートキーで並べ替え（field が None ならスキャン順のまま）"""
+        field = self.sort_field if field is None else field
+        descending = self.sort_descending if descending is None else descending
+        if not field:
+            return list(addons)
+        if field == 'file_size':
+            # サイズは後から計算されるため、キャッシュせず数値をそのまま使う（未計算は末尾）
+            key = lambda addon: (addon.get('file_size') is not None, addon.get('file_size') or 0)
+            if not descending:
+                key = lambda addon: (addon.get('file_size') is None, addon.get('file_size') or 0)
+        else:
+            key = lambda addon: self._addon_view(addon)['keys'][field]
+        return sorted(addons, key=key, reverse=descending)
+    
+    def _render_local_page(self):
+        """並べ替え済みビューの次のページを描画（大量のアドオンでも一度に全件は描画しない）"""
+        self._remove_more_link()
+        start = self._local_rendered
+        end = min(start + LOCAL_PAGE_SIZE, len(self._local_view))
+        pending_sizes = []
+        
+        for i in range(start + 1, end + 1):
+            addon = self._local_view[i - 1]
+            view = self._addon_view(addon)
+            if addon['type'] == 'folder' and addon.get('file_size') is None:
+                # キャッシュがあればすぐ表示し、未計算・キャッシュ済みのどちらも裏で計算・検証する
+                addon['file_size'] = self.get_cached_folder_size(addon['file_path'], addon.get('modified_date'))
+                pending_sizes.append((i, addon))
+            
+            # アドオン名
+            self.local_text.insert(tk.END, f"🔧 {i}. {addon['name']}\n", "addon_header")
+            
+            # 基本情報
+            info_lines = [
+                f"   📊 バージョン: {view['version_str']}",
+                f"   👤 作者: {addon['author']}",
+                f"   📂 カテゴリ: {addon['category']}",
+                f"   🎯 対応Blender: {view['blender_str']}+",
+                None,  # サイズ（後から差し替えるため個別に挿入）
+                f"   📅 更新: {view['mod_str']}",
+                f"   📄 タイプ: {view['type_str']}"
+            ]
+            
+            for line in info_lines:
+                if line is None:
+                    self.local_text.insert(tk.END, "   💾 サイズ: ", "addon_info")
+                    self.local_text.insert(tk.END, self._format_size(addon), ("addon_info", f"size_{i}"))
+                    self.local_text.insert(tk.END, "\n", "addon_info")
+                else:
                     self.local_text.insert(tk.END, line + "\n", "addon_info")
-                
-                # パス情報
-                self.local_text.insert(tk.END, f"   📍 場所: {addon['file_path']}\n", "addon_path")
-                
-                # 説明
-                desc = addon['description'][:100] + "..." if len(addon['description']) > 100 else addon['description']
-                self.local_text.insert(tk.END, f"   📝 {desc}\n", "addon_info")
-                
-                # アクションボタン（クリッカブルテキスト）
-                actions_line = f"   [📁 {self.get_text('open_folder')}] [🗑️ {self.get_text('delete')}] [ℹ️ 詳細]\n"
-                start_pos = self.local_text.index("end-1c linestart")
-                self.local_text.insert(tk.END, actions_line, "addon_action")
-                end_pos = self.local_text.index("end-1c lineend")
+            
+            # パス情報
+            self.local_text.insert(tk.END, f"   📍 場所: {addon['file_path']}\n", "addon_path")
+            
+            # 説明
+            self.local_text.insert(tk.END, f"   📝 {view['description']}\n", "addon_info")
+            
+            # アクションボタン（クリッカブルテキスト、アクションごとにタグを分ける）
+            actions = [
+                ('open', f"[📁 {self.get_text('open_folder')}]"),
+                ('delete', f"[🗑️ {self.get_text('delete')}]"),
+                ('trash', f"[🚮 {self.get_text('move_to_trash')}]"),
+                ('copy', f"[📋 {self.get_text('copy_to_version')}]"),
+                ('details', "[ℹ️ 詳細]"),
+            ]
+            self.local_text.insert(tk.END, "  ")
+            for action, label in actions:
+                action_tag = f"action_{i}_{action}"
+                self.local_text.insert(tk.END, " ")
+                self.local_text.insert(tk.END, label, ("addon_action", action_tag))
                 
                 # クリックイベント設定
-                action_tag = f"action_{i}"
-                self.local_text.tag_add(action_tag, start_pos, end_pos)
                 self.local_text.tag_bind(action_tag, "<Button-1>", 
-                    lambda e, addon_data=addon: self.on_addon_action_click(e, addon_data))
+                    lambda e, a=action, addon_data=addon: self.on_addon_action_click(a, addon_data))
                 self.local_text.tag_bind(action_tag, "<Enter>", 
                     lambda e: self.local_text.config(cursor="hand2"))
                 self.local_text.tag_bind(action_tag, "<Leave>", 
                     lambda e: self.local_text.config(cursor=""))
-                
-                self.local_text.insert(tk.END, "\n" + "-" * 70 + "\n\n")
+            
+            self.local_text.insert(tk.END, "\n\n" + "-" * 70 + "\n\n")
         
-        except Exception as e:
-            self.local_text.delete(1.0, tk.END)
-            self.local_text.insert(tk.END, f"❌ エラーが発生しました: {e}\n")
+        self._local_rendered = end
+        if end < len(self._local_view):
+            remaining = len(self._local_view) - end
+            self.local_text.insert(tk.END, f"[⬇️ {self.get_text('show_more').format(remaining)}]",
+                                   ("addon_action", "show_more"))
+            self.local_text.tag_bind("show_more", "<Button-1>", lambda e: self._render_local_page())
+            self.local_text.tag_bind("show_more", "<Enter>",
+                lambda e: self.local_text.config(cursor="hand2"))
+            self.local_text.tag_bind("show_more", "<Leave>",
+                lambda e: self.local_text.config(cursor=""))
+        
+        if pending_sizes:
+            self._schedule_size_computation(pending_sizes, self._local_render_generation)
+    
+    def _remove_more_link(self):
+        """「さらに表示」リンクを取り除く"""
+        ranges = self.local_text.tag_ranges("show_more")
+        if ranges:
+            self.local_text.delete(ranges[0], ranges[1])
+    
+    def on_sort_selected(self, event=None):
+        """並べ替え項目の変更（ソートキーはキャッシュ済みなので再表示だけ）"""
+        label = self.sort_combo.get()
+        self.sort_field = self._sort_choices.get(label)
+        self.display_local_addons()
+    
+    def toggle_sort_order(self):
+        """昇順/降順の切り替え"""
+        self.sort_descending = not self.sort_descending
+        self.sort_order_btn.config(text="▼" if self.sort_descending else "▲")
+        self.display_local_addons()
+    
+    def _facet_label(self, field, value):
+        """ファセット値の表示名"""
+        if field == 'blender_version':
+            return "不明" if value == (0, 0) else f"≥ {value[0]}.{value[1]}"
+        if field == 'type':
+            return {'file': 'ファイル', 'folder': 'フォルダ', 'zip': 'ZIP'}.get(value, value)
+        if field == 'folder':
+            version = blender_version_from_path(value)
+            name = os.path.basename(value.rstrip('/\\'))
+            return f"{version}/{name}" if version else name
+        return value
+    
+    def refresh_facet_filters(self):
+        """ファセットの選択肢とライブ件数を更新"""
+        if not hasattr(self, 'facet_combos'):
+            return
+        counts = self.facet_index.counts(self.facet_filters)
+        all_label = self.get_text('facet_all')
+        for field, combo in self.facet_combos.items():
+            field_counts = counts[field]
+            if field == 'blender_version':
+                values = sorted(field_counts, reverse=True)
+            else:
+                values = sorted(field_counts, key=lambda v: (-field_counts[v], str(v)))
+            choices = {all_label: None}
+            for value in values:
+                choices[f"{self._facet_label(field, value)} ({field_counts[value]})"] = value
+            self._facet_choices[field] = choices
+            combo['values'] = list(choices)
+            
+            selected = self.facet_filters[field]
+            current = next((label for label, value in choices.items() if value == selected), all_label)
+            combo.set(current)
+    
+    def on_facet_selected(self, field):
+        """ファセット選択時に絞り込んで再表示"""
+        label = self.facet_combos[field].get()
+        self.facet_filters[field] = self._facet_choices[field].get(label)
+        self.display_local_addons()
+    
+    def clear_facet_filters(self):
+        """絞り込みを解除"""
+        self.facet_filters = {field: None for field in FACET_FIELDS}
+        self.display_local_addons()
     
-    def on_addon_action_click(self, event, addon_data):
+    def on_addon_action_click(self, action, addon_data):
         """アドオンアクションクリック処理"""
-        # クリック位置のテキストを取得
-        index = self.local_text.index("@%s,%s" % (event.x, event.y))
-        line_start = self.local_text.index("%s linestart" % index)
-        line_end = self.local_text.index("%s lineend" % index)
-        line_text = self.local_text.get(line_start, line_end)
-        
-        if "📁" in line_text:
+        if action == 'open':
             # フォルダを開く
             self.open_addon_folder(addon_data)
-        elif "🗑️" in line_text:
+        elif action == 'delete':
             # 削除
             self.delete_addon(addon_data)
-        elif "ℹ️" in line_text:
+        elif action == 'trash':
+            # ゴミ箱へ移動
+            self.trash_addon(addon_data)
+        elif action == 'copy':
+            # 別バージョンへコピー
+            self.copy_addon_to_folder(addon_data)
+        elif action == 'details':
             # 詳細表示
             self.show_addon_details(addon_data)
     
@@ -858,23 +3891,224 @@ class BlenderStyleSearchTool:
         except Exception as e:
             messagebox.showerror("エラー", f"フォルダを開けませんでした: {e}")
     
-    def delete_addon(self, addon_data):
-        """アドオン削除"""
-        addon_name = addon_data['name']
-        if messagebox.askyesno("確認", f"'{addon_name}' を削除しますか？\n\n注意: この操作は元に戻せません。"):
-            try:
-                file_path = Path(addon_data['file_path'])
-                if file_path.is_file():
-                    file_path.unlink()
-                elif file_path.is_dir():
-                    import shutil
-                    shutil.rmtree(str(file_path))
-                
-                messagebox.showinfo("完了", f"'{addon_name}' を削除しました")
-                self.scan_and_display_local_addons()  # リストを更新
-                
-            except Exception as e:
-                messagebox.showerror("エラー", f"削除に失敗しました: {e}")
+    def delete_addon(self, addon_data):
+        """アドオン削除（バックグラウンドで実行）"""
+        addon_name = addon_data['name']
+        if messagebox.askyesno("確認", f"'{addon_name}' を削除しますか？\n\n注意: この操作は元に戻せません。"):
+            path = addon_data['file_path']
+            self.operation_queue.submit(
+                f"🗑️ {addon_name}",
+                lambda op: delete_path(path, op),
+                on_success=lambda result: self._remove_addon_record(path),
+                done_message=f"'{addon_name}' を削除しました"
+            )
+    
+    def trash_addon(self, addon_data):
+        """アドオンをゴミ箱へ移動（バックグラウンドで実行）"""
+        addon_name = addon_data['name']
+        if messagebox.askyesno("確認", f"'{addon_name}' をゴミ箱へ移動しますか？"):
+            path = addon_data['file_path']
+            trash_dir = os.path.join(addon_data['folder_path'], TRASH_FOLDER_NAME)
+            self.operation_queue.submit(
+                f"🚮 {addon_name}",
+                lambda op: move_to_trash(path, trash_dir, op),
+                on_success=lambda result: self._remove_addon_record(path),
+                done_message=f"'{addon_name}' をゴミ箱へ移動しました"
+            )
+    
+    def copy_addon_to_folder(self, addon_data):
+        """アドオンを別のアドオンフォルダ（別バージョン）へコピー"""
+        target_root = self._choose_addon_folder(exclude=addon_data['folder_path'])
+        if not target_root:
+            return
+        self._submit_install(addon_data['file_path'], target_root, f"📋 {addon_data['name']}")
+    
+    def install_addon(self):
+        """.py / .zip のアドオンをアドオンフォルダへインストール"""
+        source = filedialog.askopenfilename(
+            title="インストールするアドオンを選択",
+            filetypes=[("Blender Addon", "*.py *.zip"), ("All files", "*.*")]
+        )
+        if not source:
+            return
+        target_root = self._choose_addon_folder()
+        if not target_root:
+            return
+        if source.lower().endswith('.zip'):
+            self.install_addon_zip(source, target_root)
+        else:
+            self._submit_install(source, target_root, f"📥 {Path(source).name}")
+    
+    def install_addon_zip(self, zip_path, target_root):
+        """ZIPから必要なメンバーだけを展開してインストール"""
+        addon_info = self.inspect_addon_zip(zip_path)
+        if not addon_info:
+            messagebox.showerror("エラー", f"ZIP内にアドオンが見つかりません:\n{zip_path}")
+            return
+        install_name = addon_info['install_name']
+        try:
+            destination = addon_install_destination(target_root, install_name)
+        except ValueError as e:
+            messagebox.showerror("エラー", str(e))
+            return
+        if os.path.exists(destination):
+            if not messagebox.askyesno("確認", f"既に存在します。上書きしますか？\n{destination}"):
+                return
+        prefix = addon_info['zip_prefix']
+        self.operation_queue.submit(
+            f"📥 {addon_info['name']}",
+            lambda op: extract_addon_zip(zip_path, target_root, install_name, prefix, op),
+            on_success=lambda result: self._add_addon_record(destination, target_root),
+            done_message=f"インストールしました: {destination}"
+        )
+    
+    def show_zip_index(self):
+        """フォルダ内のZIPを解析して一覧表示"""
+        folder = filedialog.askdirectory(title="ZIPのあるフォルダを選択")
+        if not folder:
+            return
+        self.status_var.set(self.get_text('indexing_zips'))
+        
+        def worker():
+            try:
+                archives = self.index_zip_folder(folder)
+                report = self._format_zip_report(folder, archives)
+                self.root.after(0, lambda: self._show_zip_report(report))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"ZIPの解析に失敗しました: {e}"))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _show_zip_report(self, report):
+        """ZIP解析結果を表示（UIスレッド）"""
+        self.status_var.set(self.get_text('ready'))
+        self._show_scrollable_info(self.get_text('zip_index'), report)
+    
+    def _format_zip_report(self, folder, archives):
+        """ZIP解析結果を文字列に整形"""
+        if not archives:
+            return f"アドオンを含むZIPが見つかりませんでした\n📁 {folder}"
+        lines = [f"🗜️ {len(archives)}個のアドオンZIP  📁 {folder}", ""]
+        for addon in sorted(archives, key=lambda a: a['name'].lower()):
+            version_str = ".".join(map(str, addon['version']))
+            blender_ver = ".".join(map(str, addon['blender_version']))
+            kind = "エクステンション" if addon['format'] == 'manifest' else "bl_info"
+            lines.append(f"🔧 {addon['name']}  v{version_str}  (Blender {blender_ver}+, {kind})")
+            lines.append(f"   📝 {addon['description']}")
+            lines.append(f"   📍 {addon['file_path']} → {addon['install_name']}")
+        return "\n".join(lines)
+    
+    def _submit_install(self, source, target_root, label):
+        """コピー/インストール操作をキューに追加"""
+        destination = os.path.join(target_root, os.path.basename(source.rstrip('/\\')))
+        if os.path.exists(destination):
+            if not messagebox.askyesno("確認", f"既に存在します。上書きしますか？\n{destination}"):
+                return
+        self.operation_queue.submit(
+            label,
+            lambda op: copy_path(source, destination, op, overwrite=True),
+            on_success=lambda result: self._add_addon_record(destination, target_root),
+            done_message=f"コピーしました: {destination}"
+        )
+    
+    def _choose_addon_folder(self, exclude=None):
+        """アドオンフォルダを選択するダイアログ（登録済みフォルダから選ぶ）"""
+        folders = [folder for folder in self.addon_folders if folder != exclude]
+        if not folders:
+            folder = filedialog.askdirectory(title="アドオンフォルダを選択")
+            return folder or None
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title(self.get_text('choose_folder'))
+        dialog.configure(bg=self.colors['bg_dark'])
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        listbox = tk.Listbox(
+            dialog,
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text_white'],
+            selectbackground=self.colors['accent_blue'],
+            relief='flat',
+            width=80,
+            height=min(12, len(folders))
+        )
+        for folder in folders:
+            listbox.insert(tk.END, folder)
+        listbox.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        selected = {}
+        def confirm(event=None):
+            selection = listbox.curselection()
+            if selection:
+                selected['folder'] = folders[selection[0]]
+            dialog.destroy()
+        
+        listbox.bind('<Double-Button-1>', confirm)
+        tk.Button(
+            dialog,
+            text="OK",
+            command=confirm,
+            bg=self.colors['accent_blue'],
+            fg='white',
+            relief='flat',
+            padx=15
+        ).pack(pady=(0, 10))
+        
+        self.root.wait_window(dialog)
+        return selected.get('folder')
+    
+    def _remove_addon_record(self, path):
+        """操作結果をインベントリに反映（削除）して再表示"""
+        self.local_addons = [addon for addon in self.local_addons if addon['file_path'] != path]
+        self.facet_index.remove(path)
+        self.compat_matrix.remove(path)
+        self.display_local_addons()
+        self.save_inventory_cache()
+    
+    def _add_addon_record(self, path, folder):
+        """操作結果をインベントリに反映（追加/置換）して再表示"""
+        addon_info = self.scan_single_addon(path, folder)
+        self.local_addons = [addon for addon in self.local_addons if addon['file_path'] != path]
+        self.facet_index.remove(path)
+        self.compat_matrix.remove(path)
+        if addon_info:
+            self.local_addons.append(addon_info)
+            self.facet_index.add(addon_info)
+            self.compat_matrix.update(addon_info)
+            self.autocomplete.add(addon_info['name'], self._addon_name_weight())
+        self.display_local_addons()
+        self.save_inventory_cache()
+    
+    def _on_operation_progress(self, op):
+        """操作キューの進捗通知（ワーカースレッドから呼ばれる）"""
+        # 通知時点の状態を写し取る（afterの実行時には操作が先に進んでいることがある）
+        status, progress, error = op.status, op.progress, op.error
+        self.root.after(0, lambda: self._show_operation_progress(op, status, progress, error))
+    
+    def _show_operation_progress(self, op, status, progress, error):
+        """進捗をステータスバーに表示し、完了時はインベントリを更新（UIスレッド）"""
+        if status == 'running':
+            self.status_var.set(f"⏳ {op.label} {progress:.0%}")
+            return
+        # 完了通知は1回だけ処理する
+        if op._finished:
+            return
+        op._finished = True
+        if status == 'done':
+            self.status_var.set(f"✅ {op.done_message or op.label}")
+            if op.on_success:
+                op.on_success(op.result)
+        elif status == 'cancelled':
+            self.status_var.set(f"⏹ {op.label}: {self.get_text('cancelled')}")
+        elif status == 'failed':
+            self.status_var.set(f"❌ {op.label}")
+            messagebox.showerror("エラー", f"{op.label} に失敗しました: {error}")
+    
+    def cancel_operations(self):
+        """実行中・待機中の操作を中止"""
+        self.operation_queue.cancel_all()
     
     def show_addon_details(self, addon_data):
         """アドオン詳細表示"""
@@ -886,7 +4120,7 @@ class BlenderStyleSearchTool:
 👤 作者: {addon_data['author']}
 📂 カテゴリ: {addon_data['category']}
 🎯 対応Blender: {".".join(map(str, addon_data['blender_version']))}+
-💾 ファイルサイズ: {addon_data['file_size'] / (1024 * 1024):.2f} MB
+💾 ファイルサイズ: {self._format_size(addon_data)}
 📄 タイプ: {'ファイル' if addon_data['type'] == 'file' else 'フォルダ'}
 📍 場所: {addon_data['file_path']}
 📅 更新日時: {datetime.fromtimestamp(addon_data['modified_date']).strftime('%Y-%m-%d %H:%M:%S')}
@@ -896,12 +4130,446 @@ class BlenderStyleSearchTool:
         """
         messagebox.showinfo(f"'{addon_data['name']}' の詳細", details)
     
+    # 重複アドオン検出
+    def _load_hash_cache(self):
+        """ハッシュキャッシュ読み込み"""
+        if self._hash_cache is not None:
+            return self._hash_cache
+        self._hash_cache = {}
+        try:
+            if os.path.exists(self.hash_cache_file):
+                with open(self.hash_cache_file, 'r', encoding='utf-8') as f:
+                    self._hash_cache = json.load(f)
+        except Exception as e:
+            print(f"ハッシュキャッシュ読み込みエラー: {e}")
+        return self._hash_cache
+    
+    def _save_hash_cache(self):
+        """ハッシュキャッシュ保存"""
+        try:
+            with open(self.hash_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._hash_cache, f)
+        except Exception as e:
+            print(f"ハッシュキャッシュ保存エラー: {e}")
+    
+    def hash_addons(self, addons, max_workers=None, prune=False):
+        """アドオンごとの内容ハッシュを計算（未変更ファイルはキャッシュを使用）
+
+        戻り値: {file_path: (ハッシュ, 合計サイズ)}
+        対象アドオン内で見つからなくなったファイルはキャッシュから消す。
+        prune=True なら対象外のファイルもすべて消す（全アドオンを対象にしたとき）。
+        """
+        cache = self._load_hash_cache()
+        manifests = {}
+        to_hash = {}
+        
+        # 対象ファイルを列挙し、キャッシュに無い（または変更された）ものだけ集める
+        for addon in addons:
+            files = []
+            for rel_path, path, st in iter_addon_files(addon['file_path']):
+                files.append((rel_path, path, st.st_size))
+                cached = cache.get(path)
+                if not (cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size):
+                    to_hash[path] = (st.st_mtime_ns, st.st_size)
+            manifests[addon['file_path']] = files
+        
+        # ハッシュ計算はI/O中にGILを解放するのでスレッドプールで並列化
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 4) * 2)) as executor:
+                paths = list(to_hash)
+                for path, digest in zip(paths, executor.map(self._safe_hash_file, paths)):
+                    if digest is not None:
+                        cache[path] = [to_hash[path][0], to_hash[path][1], digest]
+        
+        # 削除されたファイル（とアドオン）の項目を消す
+        seen = {path for files in manifests.values() for _, path, _ in files}
+        if prune:
+            stale = [path for path in cache if path not in seen]
+        else:
+            roots = tuple(os.path.join(addon_path, '') for addon_path in manifests)
+            stale = [path for path in cache
+                     if path not in seen and (path in manifests or path.startswith(roots))]
+        for path in stale:
+            del cache[path]
+        
+        if to_hash or stale:
+            self._save_hash_cache()
+        
+        # パッケージのハッシュ = 相対パスとファイルハッシュの組を並べたもののハッシュ
+        results = {}
+        for addon_path, files in manifests.items():
+            package_digest = hashlib.sha256()
+            total_size = 0
+            for rel_path, path, size in sorted(files):
+                entry = cache.get(path)
+                package_digest.update(rel_path.encode('utf-8'))
+                package_digest.update(b'\0')
+                package_digest.update((entry[2] if entry else 'unreadable').encode('ascii'))
+                package_digest.update(b'\n')
+                total_size += size
+            results[addon_path] = (package_digest.hexdigest(), total_size)
+        return results
+    
+    @staticmethod
+    def _safe_hash_file(path):
+        """読み込めないファイルはNoneを返す"""
+        try:
+            return hash_file(path)
+        except OSError:
+            return None
+    
+    def find_duplicate_addons(self):
+        """バージョン別フォルダ間で同じアドオンを検出し、同一/差異ありに分類"""
+        addons = self.ensure_local_addons()
+        
+        # Blenderはモジュール名（ファイル名/フォルダ名）でアドオンを識別する
+        groups = {}
+        for addon in addons:
+            module_name = Path(addon['file_path']).stem
+            groups.setdefault(module_name, []).append(addon)
+        groups = {name: copies for name, copies in groups.items() if len(copies) > 1}
+        
+        hashes = self.hash_addons([addon for copies in groups.values() for addon in copies])
+        
+        duplicates = []
+        for module_name, copies in sorted(groups.items()):
+            variants = {}
+            for addon in copies:
+                digest, size = hashes[addon['file_path']]
+                variants.setdefault(digest, []).append((addon, size))
+            duplicates.append({
+                'module': module_name,
+                'identical': len(variants) == 1,
+                'variants': list(variants.values()),
+                # 同一内容のコピーは1つを残せば削除可能
+                'reclaimable': sum(size for group in variants.values() for _, size in group[1:])
+            })
+        return duplicates
+    
+    def show_duplicate_addons(self):
+        """重複チェックをバックグラウンドで実行して結果を表示"""
+        self.status_var.set(self.get_text('checking_duplicates'))
+        
+        def worker():
+            try:
+                duplicates = self.find_duplicate_addons()
+                report = self._format_duplicate_report(duplicates)
+                self.root.after(0, lambda: self._show_duplicate_report(report))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"重複チェックに失敗しました: {e}"))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _show_duplicate_report(self, report):
+        """重複チェック結果を表示（UIスレッド）"""
+        self.status_var.set(self.get_text('ready'))
+        self._show_scrollable_info(self.get_text('duplicates'), report)
+    
+    def _format_duplicate_report(self, duplicates):
+        """重複チェック結果を文字列に整形"""
+        if not duplicates:
+            return "重複しているアドオンはありません"
+        
+        reclaimable = sum(item['reclaimable'] for item in duplicates)
+        lines = [
+            f"🧬 重複アドオン: {len(duplicates)}件",
+            f"💾 削除可能な重複サイズ: {reclaimable / (1024 * 1024):.2f} MB",
+            ""
+        ]
+        for item in duplicates:
+            status = "✅ 同一" if item['identical'] else f"⚠️ 差異あり（{len(item['variants'])}種類）"
+            lines.append(f"🔧 {item['module']} - {status}")
+            for number, group in enumerate(item['variants'], 1):
+                for addon, size in group:
+                    version_str = ".".join(map(str, addon['version']))
+                    lines.append(f"   [{number}] v{version_str}  {size / (1024 * 1024):.2f} MB  {addon['file_path']}")
+            lines.append("")
+        return "\n".join(lines)
+    
+    # アドオン更新チェック
+    def get_addon_repository(self, addon):
+        """アドオンに対応するGitHubリポジトリ（ユーザー指定 > doc_url > tracker_url）"""
+        module_name = Path(addon['file_path']).stem
+        mapping = self.settings.get('update_repo_map', {})
+        if module_name in mapping:
+            return mapping[module_name]
+        return (github_repo_from_url(addon.get('doc_url'))
+                or github_repo_from_url(addon.get('tracker_url')))
+    
+    def _fetch_latest_release(self, session, api_base, repo, cached):
+        """最新リリースを取得（ETagによる条件付きリクエスト）"""
+        headers = {'Accept': 'application/vnd.github+json'}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        
+        response = session.get(f"{api_base}/repos/{repo}/releases/latest", headers=headers, timeout=10)
+        if response.status_code == 304:
+            return dict(cached, checked_at=time.time())
+        if response.status_code == 404:
+            return {'tag': None, 'html_url': f"https://github.com/{repo}", 'etag': None,
+                    'checked_at': time.time()}
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        
+        data = response.json()
+        return {
+            'tag': data.get('tag_name'),
+            'html_url': data.get('html_url', f"https://github.com/{repo}"),
+            'etag': response.headers.get('ETag'),
+            'checked_at': time.time()
+        }
+    
+    def _check_link(self, session, url, cached):
+        """1件のURLを確認（HEAD、使えなければ条件付きGET。リダイレクトは追跡して最終URLを記録）"""
+        response = session.head(url, allow_redirects=True, timeout=10)
+        if response.status_code in (403, 405, 501):
+            # HEADを受け付けないサーバー向け（本文は読まない）
+            headers = {}
+            if cached and cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached and cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+            response = session.get(url, headers=headers, allow_redirects=True, timeout=10, stream=True)
+            response.close()
+            if response.status_code == 304 and cached:
+                return dict(cached, checked_at=time.time())
+        
+        code = response.status_code
+        final_url = response.url or url
+        if code in (404, 410):
+            status = 'dead'
+        elif code >= 400:
+            status = 'error'  # 403・429・5xx などは一時的・アクセス制限の可能性があるので dead にはしない
+        elif response.history and final_url.rstrip('/') != url.rstrip('/'):
+            status = 'redirect'
+        else:
+            status = 'ok'
+        return {
+            'status': status,
+            'code': code,
+            'final_url': final_url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'checked_at': time.time()
+        }
+    
+    def check_bookmark_links(self, urls=None, max_workers=LINK_CHECK_WORKERS,
+                             per_host=LINK_CHECK_PER_HOST, on_progress=None):
+        """ブックマークのリンク切れ・リダイレクトを並行して確認（結果はキャッシュし URL -> 結果 を返す）"""
+        if urls is None:
+            urls = [bookmark['url'] for bookmark in self.bookmarks]
+        try:
+            with open(self.link_check_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        
+        now = time.time()
+        stale = [url for url in dict.fromkeys(urls)
+                 if now - cache.get(url, {}).get('checked_at', 0) >= LINK_CHECK_TTL]
+        
+        if stale:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            # ホストごとの待ち行列（同じホストへの同時リクエスト数は投入側で制限し、
+            # ワーカーがホストの空きを待って塞がらないようにする）
+            by_host = {}
+            for url in stale:
+                by_host.setdefault(urlparse(url).netloc, []).append(url)
+            by_host = {host: iter(host_urls) for host, host_urls in by_host.items()}
+            
+            def check(url):
+                try:
+                    return self._check_link(session, url, cache.get(url))
+                except Exception as e:
+                    return {'status': 'error', 'code': None, 'error': str(e), 'checked_at': time.time()}
+            
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    running = {}
+                    
+                    def submit_next(host):
+                        url = next(by_host[host], None)
+                        if url is not None:
+                            running[executor.submit(check, url)] = (host, url)
+                    
+                    for host in by_host:
+                        for _ in range(per_host):
+                            submit_next(host)
+                    done = 0
+                    while running:
+                        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            host, url = running.pop(future)
+                            cache[url] = future.result()
+                            done += 1
+                            if on_progress:
+                                on_progress(done, len(stale))
+                            submit_next(host)
+            finally:
+                session.close()
+            
+            try:
+                with open(self.link_check_cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(cache, f, ensure_ascii=False)
+            except Exception as e:
+                print(f"リンク確認キャッシュ保存エラー: {e}")
+        
+        results = {url: cache[url] for url in urls if url in cache}
+        self.link_status.update(results)
+        return results
+    
+    def show_link_check(self):
+        """ブックマークのリンク確認をバックグラウンドで実行して一覧に反映"""
+        if not self.bookmarks:
+            return
+        self.status_var.set(self.get_text('checking_links'))
+        
+        def progress(done, total):
+            if done % 50 == 0 or done == total:
+                self.root.after(0, lambda: self.status_var.set(
+                    f"{self.get_text('checking_links')} {done}/{total}"))
+        
+        def worker():
+            try:
+                results = self.check_bookmark_links(on_progress=progress)
+                broken = sum(1 for result in results.values() if result['status'] in ('dead', 'redirect'))
+                self.root.after(0, lambda: (
+                    self.refresh_bookmarks(),
+                    self.status_var.set(self.get_text('link_check_done').format(len(results), broken))
+                ))
+            except Exception as e:
+                self.root.after(0, lambda: self.status_var.set(f"❌ リンク確認エラー: {e}"))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def check_addon_updates(self, addons=None, api_base=None, max_workers=UPDATE_CHECK_WORKERS):
+        """インストール済みアドオンとGitHubの最新リリースを比較"""
+        if addons is None:
+            addons = self.ensure_local_addons()
+        api_base = (api_base or self.settings.get('github_api_base') or GITHUB_API_BASE).rstrip('/')
+        
+        try:
+            with open(self.update_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        
+        repos = {}
+        for addon in addons:
+            repo = self.get_addon_repository(addon)
+            if repo:
+                repos.setdefault(repo, []).append(addon)
+        
+        # キャッシュが新しいリポジトリは問い合わせない
+        now = time.time()
+        stale = [repo for repo in repos
+                 if now - cache.get(repo, {}).get('checked_at', 0) >= UPDATE_CHECK_TTL]
+        errors = {}
+        
+        if stale:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            # トークンは既定のGitHub APIにだけ送る（差し替え先のホストには渡さない）
+            token = os.environ.get('GITHUB_TOKEN') if api_base == GITHUB_API_BASE else None
+            if token:
+                session.headers['Authorization'] = f"Bearer {token}"
+            
+            def fetch(repo):
+                return self._fetch_latest_release(session, api_base, repo, cache.get(repo))
+            
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(fetch, repo): repo for repo in stale}
+                    for future, repo in futures.items():
+                        try:
+                            cache[repo] = future.result()
+                        except Exception as e:
+                            errors[repo] = str(e)
+            finally:
+                session.close()
+            
+            try:
+                with open(self.update_cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(cache, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                print(f"更新チェックキャッシュ保存エラー: {e}")
+        
+        results = []
+        for repo, repo_addons in repos.items():
+            entry = cache.get(repo, {})
+            latest = parse_version_string(entry.get('tag')) if entry.get('tag') else None
+            for addon in repo_addons:
+                installed = (version_tuple(addon.get('version')) + (0, 0, 0))[:3]
+                if repo in errors:
+                    status = 'error'
+                elif latest is None:
+                    status = 'unknown'
+                elif latest > installed:
+                    status = 'outdated'
+                else:
+                    status = 'up_to_date'
+                results.append({
+                    'addon': addon,
+                    'repo': repo,
+                    'latest': entry.get('tag'),
+                    'url': entry.get('html_url'),
+                    'status': status,
+                    'error': errors.get(repo)
+                })
+        return results
+    
+    def show_update_check(self):
+        """更新チェックをバックグラウンドで実行して結果を表示"""
+        self.status_var.set(self.get_text('checking_updates'))
+        
+        def worker():
+            try:
+                results = self.check_addon_updates()
+                report = self._format_update_report(results)
+                self.root.after(0, lambda: self._show_update_report(report))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"更新チェックに失敗しました: {e}"))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _show_update_report(self, report):
+        """更新チェック結果を表示（UIスレッド）"""
+        self.status_var.set(self.get_text('ready'))
+        self._show_scrollable_info(self.get_text('check_updates'), report)
+    
+    def _format_update_report(self, results):
+        """更新チェック結果を文字列に整形"""
+        if not results:
+            return "GitHubリポジトリが分かるアドオンがありません\n（settings.json の update_repo_map で指定できます）"
+        
+        labels = {'outdated': '⬆️ 更新あり', 'up_to_date': '✅ 最新',
+                  'unknown': '❔ リリースなし', 'error': '❌ エラー'}
+        order = ['outdated', 'error', 'unknown', 'up_to_date']
+        outdated = sum(1 for item in results if item['status'] == 'outdated')
+        lines = [f"⬆️ 更新のあるアドオン: {outdated}件 / {len(results)}件", ""]
+        for item in sorted(results, key=lambda r: (order.index(r['status']), r['addon']['name'].lower())):
+            addon = item['addon']
+            version_str = ".".join(map(str, addon['version']))
+            lines.append(f"{labels[item['status']]}  {addon['name']}  v{version_str} → {item['latest'] or '-'}")
+            lines.append(f"   🔗 {item['url'] or item['repo']}")
+            if item['error']:
+                lines.append(f"   📝 {item['error']}")
+        return "\n".join(lines)
+    
     def add_custom_folder(self):
         """カスタムアドオンフォルダを追加"""
         folder = filedialog.askdirectory(title="アドオンフォルダを選択")
         if folder:
             if folder not in self.addon_folders:
                 self.addon_folders.append(folder)
+                self.custom_folders.append(folder)
+                self.settings['custom_folders'] = self.custom_folders
+                self.save_settings()
                 messagebox.showinfo("成功", f"{self.get_text('folder_added')}:\n{folder}")
             else:
                 messagebox.showwarning("警告", self.get_text('folder_exists'))
@@ -957,6 +4625,20 @@ class BlenderStyleSearchTool:
         )
         bookmark_frame.pack(fill='x', pady=(0, 15))
         
+        # 絞り込み（入力のたびに一覧を更新）
+        self.bookmark_filter_var = tk.StringVar()
+        self.bookmark_filter_var.trace_add('write', self.on_bookmark_filter_changed)
+        bookmark_filter_entry = tk.Entry(
+            bookmark_frame,
+            textvariable=self.bookmark_filter_var,
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_dark'],
+            fg=self.colors['text_white'],
+            relief='flat',
+            insertbackground=self.colors['text_white']
+        )
+        bookmark_filter_entry.pack(fill='x', padx=10, pady=(10, 0))
+        
         # ブックマークリストボックス
         self.bookmark_listbox = tk.Listbox(
             bookmark_frame,
@@ -970,6 +4652,7 @@ class BlenderStyleSearchTool:
         )
         self.bookmark_listbox.pack(fill='x', padx=10, pady=10)
         self.bookmark_listbox.bind('<Double-Button-1>', self.on_bookmark_double_click)
+        self.bookmark_listbox.bind('<<ListboxSelect>>', self.on_bookmark_select)
         
         # ブックマーク操作ボタン
         bookmark_btn_frame = tk.Frame(bookmark_frame, bg=self.colors['bg_medium'])
@@ -1000,6 +4683,36 @@ class BlenderStyleSearchTool:
             command=self.delete_bookmark
         )
         delete_bookmark_btn.pack(side='right')
+        
+        check_links_btn = tk.Button(
+            bookmark_btn_frame,
+            text=self.get_text('check_links'),
+            font=("Segoe UI", 8),
+            bg=self.colors['bg_light'],
+            fg='white',
+            relief='flat',
+            padx=8,
+            pady=3,
+            command=self.show_link_check
+        )
+        check_links_btn.pack(side='left')
+        
+        # 一括インポート・エクスポート
+        bookmark_io_frame = tk.Frame(bookmark_frame, bg=self.colors['bg_medium'])
+        bookmark_io_frame.pack(fill='x', padx=10, pady=(0, 5))
+        for text_key, command in (('import_bookmarks', self.import_bookmarks_dialog),
+                                  ('export_bookmarks', self.export_bookmarks_dialog)):
+            tk.Button(
+                bookmark_io_frame,
+                text=self.get_text(text_key),
+                font=("Segoe UI", 8),
+                bg=self.colors['bg_light'],
+                fg='white',
+                relief='flat',
+                padx=8,
+                pady=3,
+                command=command
+            ).pack(side='left', padx=(0, 5))
 
         # 手動追加フレーム
         add_bookmark_frame = tk.Frame(bookmark_frame, bg=self.colors['bg_medium'])
@@ -1153,6 +4866,77 @@ class BlenderStyleSearchTool:
         )
         clear_btn.pack(side='right', padx=5, pady=15)
         
+        # プロファイラ切り替え
+        self.profile_var = tk.BooleanVar(value=self.profile_enabled)
+        profile_check = tk.Checkbutton(
+            footer_frame,
+            text=self.get_text('profile'),
+            variable=self.profile_var,
+            font=("Segoe UI", 9),
+            bg=self.colors['bg_light'],
+            fg=self.colors['text_white'],
+            selectcolor=self.colors['bg_medium'],
+            activebackground=self.colors['bg_light'],
+            activeforeground=self.colors['accent_blue'],
+            command=self.toggle_profiling
+        )
+        profile_check.pack(side='right', padx=5, pady=15)
+        
+    # プロファイラ機能
+    def run_profiled(self, label, func, *args, **kwargs):
+        """プロファイル有効時はcProfileで計測しながら関数を実行"""
+        if not self.profile_enabled:
+            return func(*args, **kwargs)
+        
+        # cProfileは同時に1つしか有効化できないため、計測中の場合は通常実行
+        if not self._profile_lock.acquire(blocking=False):
+            print(f"プロファイル計測中のため通常実行します: {label}")
+            return func(*args, **kwargs)
+        
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                self._write_profile_report(label, profiler)
+        finally:
+            self._profile_lock.release()
+    
+    def _write_profile_report(self, label, profiler):
+        """計測結果を.prof（snakeviz等で表示可能）と上位関数レポート(.txt)に出力"""
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            base = os.path.join(self.profile_dir, f"{label}_{stamp}")
+            
+            # 標準ビューア用のバイナリ出力
+            profiler.dump_stats(base + ".prof")
+            
+            # 上位関数のランキング（累積時間順・自己時間順）
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.strip_dirs()
+            stream.write(f"=== {label} ({stamp}) 累積時間順 ===\n")
+            stats.sort_stats('cumulative').print_stats(30)
+            stream.write(f"=== {label} ({stamp}) 自己時間順 ===\n")
+            stats.sort_stats('tottime').print_stats(30)
+            with open(base + ".txt", 'w', encoding='utf-8') as f:
+                f.write(stream.getvalue())
+            
+            print(f"プロファイル出力: {base}.prof / {base}.txt")
+            if hasattr(self, 'root'):
+                self.root.after(0, lambda: self.status_var.set(f"🔬 プロファイル出力: {base}.txt"))
+        except Exception as e:
+            print(f"プロファイル出力エラー: {e}")
+    
+    def toggle_profiling(self):
+        """フッターのチェックボックスからプロファイラを切り替え"""
+        self.profile_enabled = self.profile_var.get()
+        state = "ON" if self.profile_enabled else "OFF"
+        self.status_var.set(f"🔬 {self.get_text('profile')}: {state}")
+        
     def search(self):
         """検索実行"""
         query = self.search_var.get().strip()
@@ -1167,48 +4951,125 @@ class BlenderStyleSearchTool:
         self.clear_results()
         
         # 非同期検索実行
-        threading.Thread(target=self._perform_search, args=(query,), daemon=True).start()
+        threading.Thread(
+            target=self.run_profiled, args=("search", self._perform_search, query), daemon=True
+        ).start()
         
     def _perform_search(self, query):
         """実際の検索処理（バックグラウンド）"""
         try:
             mode = self.search_mode.get()
-            results = []
-
-            # ローカル検索の前に、必要であればアドオンをスキャンする
-            if mode in ["local", "both"] and not hasattr(self, '_local_scanned'):
-                self.scan_local_addons()
-                self._local_scanned = True # スキャン済みフラグを立てる
+            results = None
             
-            if mode in ["local", "both"]:
-                local_results = self.search_local(query)
-                results.extend(local_results)
-                
-            if mode in ["web", "both"]:
-                # GitHub検索
-                github_results = self.search_github(query)
-                results.extend(github_results)
-                
-                # Google検索（Web検索）
-                google_results = self.search_google(query)
-                results.extend(google_results)
+            # 常駐サービスが同じフォルダを対象にしていれば温まったインデックスに問い合わせる
+            # （プロファイル計測中は自分で実行する）
+            if (self.daemon_client is not None and not self.profile_enabled
+                    and self.daemon_client.serves_folders(self.addon_folders)):
+                try:
+                    results = self.daemon_client.search(query, mode)
+                except Exception as e:
+                    print(f"常駐サービスに接続できません（ローカルで検索します）: {e}")
+                    self.daemon_client = None
+            
+            if results is None:
+                results = self.collect_search_results(query, mode)
                 
             # UI更新
             self.root.after(0, lambda: self._display_results(results, query))
             
         except Exception as e:
             self.root.after(0, lambda: self._show_error(str(e)))
+    
+    def register_search_provider(self, provider):
+        """検索元を登録（同じ名前なら置き換え）"""
+        self.search_providers[provider.name] = provider
+    
+    def collect_search_results(self, query, mode, deadline=SEARCH_DEADLINE):
+        """検索モードに該当する検索元を並行実行し、締め切りまでに届いた結果を集める（GUI・常駐サービス共通）"""
+        # ローカル検索の前に、必要であればアドオンをスキャンする
+        if mode in ["local", "both"] and not hasattr(self, '_local_scanned'):
+            self.ensure_local_addons()
+            self._local_scanned = True # スキャン済みフラグを立てる
+        
+        providers = [provider for provider in self.search_providers.values() if mode in provider.modes]
+        started = time.monotonic()
+        collected = {}
+        futures = {}
+        for provider in providers:
+            cached = self._cached_web_results((provider.name, query.lower()), provider.cache_ttl)
+            if cached is not None:
+                collected[provider.name] = cached
+            else:
+                # 各検索元の締め切りは検索開始からの絶対時刻（全体の締め切りが上限）
+                until = started + min(provider.timeout, deadline)
+                future = self._search_executor.submit(self._run_provider, provider, query, until)
+                futures[future] = (provider, until)
+        
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            for future in [future for future in pending
+                           if futures[future][1] <= now and not future.done()]:
+                pending.discard(future)
+                # まだ始まっていなければ取り消してワーカーを空ける
+                future.cancel()
+                provider = futures[future][0]
+                collected[provider.name] = [{
+                    "name": f"{provider.name} Timeout",
+                    "description": f"{provider.name} の応答が時間内にありませんでした",
+                    "type": "error"
+                }]
+            if not pending:
+                break
+            next_until = min(futures[future][1] for future in pending)
+            done, _ = wait(pending, timeout=max(0.0, next_until - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                collected[futures[future][0].name] = future.result()
+        
+        results = []
+        for provider in providers:
+            results.extend(collected.get(provider.name, []))
+        return results
+    
+    def _run_provider(self, provider, query, until=None):
+        """1つの検索元を実行（例外はエラー行に変換し、成功した結果だけキャッシュ）"""
+        try:
+            results = provider.run(query, until)
+        except Exception as e:
+            return [{"name": f"{provider.name} Search Error", "description": str(e), "type": "error"}]
+        if provider.cache_ttl and not any(result.get('type') == 'error' for result in results):
+            self._store_web_results((provider.name, query.lower()), results)
+        return results
+    
+    def _cached_web_results(self, key, ttl=WEB_CACHE_TTL):
+        """Web検索結果のキャッシュを取得（期限切れはNone）"""
+        if not ttl:
+            return None
+        with self._web_cache_lock:
+            cached = self._web_cache.get(key)
+        if cached and time.time() - cached[0] < ttl:
+            return cached[1]
+        return None
+    
+    def _store_web_results(self, key, results):
+        """Web検索結果をキャッシュ"""
+        with self._web_cache_lock:
+            self._web_cache[key] = (time.time(), results)
             
     def search_local(self, query):
         """ローカルアドオンリストから検索"""
-        if not self.local_addons:
-            self.scan_local_addons() #念のためスキャン
+        addons = self.ensure_local_addons() #念のためスキャン
 
+        # クエリの正規化は1回だけ、各アドオン側は正規化済みのものを再利用
+        normalized_query = normalize_text(query)
+        query_tokens = tokenize_text(normalized_query, normalized=True)
+        
         results = []
-        for addon in self.local_addons:
-            #名前にクエリが含まれているか、説明にクエリが含まれているか
-            if query.lower() in addon.get('name', '').lower() or \
-               query.lower() in addon.get('description', '').lower():
+        for addon in addons:
+            #名前か説明にクエリが含まれているか、クエリのトークンがすべて含まれているか
+            text, tokens = self._search_document(addon)
+            if normalized_query in text or (query_tokens and query_tokens <= tokens):
                 # _display_results が期待する形式に変換
                 results.append({
                     'name': addon.get('name', '名前なし'),
@@ -1218,8 +5079,47 @@ class BlenderStyleSearchTool:
                 })
         return results
         
+    def _search_document(self, addon):
+        """アドオンの検索用テキストとトークン（レコードごとに1回だけ作る）"""
+        cache_key = (addon.get('file_path'), addon.get('modified_date'))
+        document = self._search_cache.get(cache_key)
+        if document is None:
+            text = normalize_text(f"{addon.get('name', '')}\n{addon.get('description', '')}")
+            document = (text, frozenset(tokenize_text(text, normalized=True)))
+            self._search_cache[cache_key] = document
+        return document
+    
+    def search_catalog(self, query):
+        """オフラインのエクステンションカタログ索引から検索（索引が無ければ何も返さない）"""
+        results = []
+        for entry in self.catalog_index.search(query):
+            results.append({
+                'name': entry['name'],
+                'description': entry['description'] or '説明なし',
+                'url': entry['url'],
+                'version': entry['version'],
+                'type': 'catalog'
+            })
+        return results
+    
+    def build_catalog(self, dump_paths, merge=False):
+        """JSONダンプからカタログ索引を作成・更新（merge=True なら既存の項目にIDで上書き）"""
+        entries = {}
+        if merge and len(self.catalog_index):
+            with self.catalog_index._lock:
+                for index in range(self.catalog_index.count):
+                    entry = self.catalog_index.record(index)
+                    entries[entry['id']] = entry
+        for dump_path in dump_paths:
+            for entry in catalog_entries_from_dump(dump_path):
+                entries[entry['id']] = entry
+        # Windowsではマップ中のファイルを置き換えられないので閉じておく（次の検索で開き直す）
+        with self.catalog_index._lock:
+            self.catalog_index.close()
+        return build_catalog_index(entries.values(), self.catalog_index.path)
+    
     def search_github(self, query):
-        """GitHub API検索"""
+        """GitHub API検索（キャッシュは検索元の設定で collect_search_results 側が行う）"""
         try:
             url = "https://api.github.com/search/repositories"
             params = {
@@ -1241,7 +5141,7 @@ class BlenderStyleSearchTool:
                     "stars": item["stargazers_count"],
                     "type": "github"
                 })
-                
+            
             return results
             
         except Exception as e:
@@ -1314,6 +5214,8 @@ class BlenderStyleSearchTool:
                 self.results_text.insert(tk.END, f"   🌐 {self.get_text('web_result')}\n", "source")
             elif result["type"] == "local":
                 self.results_text.insert(tk.END, f"   💾 {self.get_text('local_db')}\n", "source")
+            elif result["type"] == "catalog":
+                self.results_text.insert(tk.END, f"   🗂️ {self.get_text('catalog_result')}\n", "source")
             else:
                 self.results_text.insert(tk.END, f"   ❌ {self.get_text('error_source')}\n", "source")
             
@@ -1400,32 +5302,136 @@ class BlenderStyleSearchTool:
 
     def add_bookmark(self, name, url, description):
         """ブックマーク追加"""
-        # 重複チェック
-        if any(bookmark['url'] == url for bookmark in self.bookmarks):
-            return False
-        
         bookmark = {
             "name": name,
             "url": url,
             "description": description,
             "timestamp": datetime.now().isoformat()
         }
-        self.bookmarks.append(bookmark)
+        # 重複チェック（URL索引）
+        if self.bookmarks.add(bookmark) is None:
+            return False
         self.save_bookmarks()
         self.refresh_bookmarks()
         return True
     
+    def import_bookmarks(self, path, fmt=None):
+        """ファイルからまとめて追加（URLで重複を除き、保存は最後に1回）。(追加数, 重複数) を返す"""
+        added = skipped = 0
+        for bookmark in iter_import_bookmarks(path, fmt):
+            if self.bookmarks.add(bookmark) is None:
+                skipped += 1
+            else:
+                added += 1
+        if added:
+            self.save_bookmarks()
+        return added, skipped
+    
+    def export_bookmarks(self, path, fmt=None):
+        """ブックマークをHTML / JSON Linesで書き出す"""
+        return write_bookmarks_file(self.bookmarks, path, fmt)
+    
+    def import_bookmarks_dialog(self):
+        """ファイルを選んでブックマークをインポート（読み込みはバックグラウンド）"""
+        path = filedialog.askopenfilename(
+            title=self.get_text('import_bookmarks'),
+            filetypes=[("Bookmarks HTML", "*.html *.htm"), ("JSON Lines", "*.jsonl *.ndjson")]
+        )
+        if not path:
+            return
+        self.status_var.set(self.get_text('importing_bookmarks'))
+        
+        def worker():
+            try:
+                items = list(iter_import_bookmarks(path))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("エラー", f"インポートに失敗しました: {e}"))
+                return
+            self.root.after(0, lambda: self._apply_imported_bookmarks(items))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _apply_imported_bookmarks(self, items):
+        """読み込んだブックマークをまとめて反映"""
+        added = sum(1 for bookmark in items if self.bookmarks.add(bookmark) is not None)
+        if added:
+            self.save_bookmarks()
+        self.refresh_bookmarks()
+        self.status_var.set(self.get_text('bookmarks_imported').format(added, len(items) - added))
+    
+    def export_bookmarks_dialog(self):
+        """保存先を選んでブックマークをエクスポート"""
+        path = filedialog.asksaveasfilename(
+            title=self.get_text('export_bookmarks'),
+            defaultextension=".html",
+            filetypes=[("Bookmarks HTML", "*.html"), ("JSON Lines", "*.jsonl")]
+        )
+        if not path:
+            return
+        try:
+            count = self.export_bookmarks(path)
+            self.status_var.set(f"📤 {count}件 → {path}")
+        except Exception as e:
+            messagebox.showerror("エラー", f"エクスポートに失敗しました: {e}")
+    
     def refresh_bookmarks(self):
-        """ブックマーク表示を更新"""
+        """ブックマーク表示を更新（絞り込み結果の先頭ページだけ並べる）"""
         self.bookmark_listbox.delete(0, tk.END)
+        self._bookmark_view = []
+        self._bookmark_rendered = 0
         
         if not self.bookmarks:
             self.bookmark_listbox.insert(0, self.get_text('no_bookmarks'))
             return
-            
-        for bookmark in self.bookmarks[-10:]:  # 最新10件表示
+        
+        self._bookmark_view = self.bookmarks.filter_ids(self.bookmark_filter_var.get())
+        self._render_bookmark_page()
+    
+    def _render_bookmark_page(self):
+        """次のページを一覧の末尾に追加（最後の行は「さらに表示」）"""
+        if self._bookmark_rendered and self._bookmark_rendered < len(self._bookmark_view):
+            self.bookmark_listbox.delete(tk.END)  # 前回の「さらに表示」行
+        start = self._bookmark_rendered
+        end = min(start + BOOKMARK_PAGE_SIZE, len(self._bookmark_view))
+        rows = []
+        for bookmark_id in self._bookmark_view[start:end]:
+            bookmark = self.bookmarks.get(bookmark_id)
             display_text = bookmark['name'][:30] + "..." if len(bookmark['name']) > 30 else bookmark['name']
-            self.bookmark_listbox.insert(tk.END, display_text)
+            # リンク切れ・リダイレクトは印を付ける
+            link_status = self.link_status.get(bookmark['url'], {}).get('status')
+            rows.append(LINK_STATUS_MARKS.get(link_status, '') + display_text)
+        if rows:
+            self.bookmark_listbox.insert(tk.END, *rows)
+        self._bookmark_rendered = end
+        if end < len(self._bookmark_view):
+            self.bookmark_listbox.insert(
+                tk.END, self.get_text('show_more').format(len(self._bookmark_view) - end))
+    
+    def on_bookmark_filter_changed(self, *args):
+        """絞り込み入力（連続入力中は少し待ってから反映）"""
+        if self._bookmark_filter_job is not None:
+            self.root.after_cancel(self._bookmark_filter_job)
+        self._bookmark_filter_job = self.root.after(150, self._apply_bookmark_filter)
+    
+    def _apply_bookmark_filter(self):
+        self._bookmark_filter_job = None
+        self.refresh_bookmarks()
+    
+    def _is_more_row(self, index):
+        return index == self._bookmark_rendered and self._bookmark_rendered < len(self._bookmark_view)
+    
+    def _selected_bookmark(self):
+        """選択行のブックマーク（行番号ではなく表示中のIDで引く）"""
+        selection = self.bookmark_listbox.curselection()
+        if not selection or selection[0] >= self._bookmark_rendered:
+            return None
+        return self.bookmarks.get(self._bookmark_view[selection[0]])
+    
+    def on_bookmark_select(self, event):
+        """「さらに表示」行の選択で次のページを読み込む"""
+        selection = self.bookmark_listbox.curselection()
+        if selection and self._is_more_row(selection[0]):
+            self._render_bookmark_page()
     
     def on_bookmark_double_click(self, event):
         """ブックマークダブルクリックで開く"""
@@ -1433,26 +5439,20 @@ class BlenderStyleSearchTool:
     
     def open_bookmark(self):
         """選択されたブックマークを開く"""
-        selection = self.bookmark_listbox.curselection()
-        if selection and self.bookmarks:
-            index = selection[0]
-            if index < len(self.bookmarks):
-                bookmark = self.bookmarks[index]
-                webbrowser.open(bookmark['url'])
+        bookmark = self._selected_bookmark()
+        if bookmark:
+            webbrowser.open(bookmark['url'])
         else:
             messagebox.showwarning("ブックマーク", self.get_text('select_bookmark'))
     
     def delete_bookmark(self):
         """選択されたブックマークを削除"""
-        selection = self.bookmark_listbox.curselection()
-        if selection and self.bookmarks:
-            index = selection[0]
-            if index < len(self.bookmarks):
-                bookmark = self.bookmarks[index]
-                if messagebox.askyesno("確認", f"'{bookmark['name']}' を削除しますか？"):
-                    self.bookmarks.pop(index)
-                    self.save_bookmarks()
-                    self.refresh_bookmarks()
+        bookmark = self._selected_bookmark()
+        if bookmark:
+            if messagebox.askyesno("確認", f"'{bookmark['name']}' を削除しますか？"):
+                self.bookmarks.remove(bookmark['id'])
+                self.save_bookmarks()
+                self.refresh_bookmarks()
         else:
             messagebox.showwarning("ブックマーク", self.get_text('select_bookmark'))
     
@@ -1600,6 +5600,66 @@ class BlenderStyleSearchTool:
             faq = """❓ Frequently Asked Questions\n\nQ: Are there free addons available?\nA: Yes! Many addons are open source and free. GitHub has a wealth of excellent free addons.\n\nQ. How reliable are web search results?\nA: GitHub repositories with many ⭐ are relatively safe. Personal blogs and Qiita articles should be used as reference, verified with official documentation.\n\nQ: How to use bookmark feature?\nA: Simply click "📌 Add to bookmarks" in search results. Access them easily from sidebar later.\n\nQ: Web search results not as expected?\nA: Try changing search keywords. Be specific like "mesh tools tutorial", "animation rigging guide".\n\nQ: Is there asset management feature?\nA: Check "📦 Asset Registration" guide for detailed Asset Browser usage in Blender 3.0+.\n\nQ: Can I use them with older Blender?\nA: Compatibility varies by addon. Check descriptions for version info.\n\nQ: Can I use addons commercially?\nA: Depends on the license. GPL, MIT, Apache open source licenses usually allow commercial use.\n\nQ: What is "My Addons" feature?\nA: A feature to list and manage addons installed on your PC. You can view details, open folders, and delete addons.\n\nQ: How to use this tool itself?\nA: 1) Enter search keywords, 2) Select search mode, 3) Click search button, 4) Use "My Addons" for local management.\n            """
         self._show_scrollable_info(self.get_text('faq'), faq)
         
+    def rebuild_autocomplete(self):
+        """検索履歴（頻度×新しさ）とアドオン名から補完候補を作り直す"""
+        entries = list(self.query_weights.items())
+        name_weight = self._addon_name_weight()
+        entries.extend((addon.get('name', ''), name_weight) for addon in self.local_addons)
+        self.autocomplete.rebuild(entries)
+    
+    def _addon_name_weight(self):
+        return recency_weight(time.time() - AUTOCOMPLETE_NAME_AGE_DAYS * 86400)
+    
+    def on_search_key(self, event):
+        """入力のたびに補完候補を更新"""
+        if event.keysym in ('Return', 'Escape', 'Down', 'Up', 'Tab'):
+            return
+        query = self.search_var.get()
+        suggestions = self.autocomplete.suggest(query) if query.strip() else []
+        if not suggestions or suggestions == [query.strip()]:
+            self.hide_suggestions()
+            return
+        self.suggestion_listbox.delete(0, tk.END)
+        for suggestion in suggestions:
+            self.suggestion_listbox.insert(tk.END, suggestion)
+        self.suggestion_listbox.config(height=len(suggestions))
+        self.suggestion_listbox.place(in_=self.search_entry, x=0, rely=1.0, relwidth=1.0)
+        self.suggestion_listbox.lift()
+    
+    def on_search_return(self, event=None):
+        """Enterで検索（候補は閉じる）"""
+        self.hide_suggestions()
+        self.search()
+    
+    def focus_suggestions(self, event=None):
+        """↓キーで候補リストへ移動"""
+        if self.suggestion_listbox.winfo_ismapped():
+            self.suggestion_listbox.focus_set()
+            self.suggestion_listbox.selection_clear(0, tk.END)
+            self.suggestion_listbox.selection_set(0)
+            self.suggestion_listbox.activate(0)
+        return "break"
+    
+    def accept_suggestion(self, event=None):
+        """選んだ候補を検索欄に入れて検索"""
+        selection = self.suggestion_listbox.curselection()
+        if not selection:
+            return
+        self.search_var.set(self.suggestion_listbox.get(selection[0]))
+        self.hide_suggestions()
+        self.search_entry.focus_set()
+        self.search_entry.icursor(tk.END)
+        self.search()
+    
+    def hide_suggestions(self):
+        """候補リストを隠す"""
+        self.suggestion_listbox.place_forget()
+    
+    def _hide_suggestions_unless_focused(self):
+        focused = self.root.focus_get()
+        if focused not in (self.search_entry, self.suggestion_listbox):
+            self.hide_suggestions()
+    
     def refresh_history(self):
         """履歴表示を更新"""
         self.history_listbox.delete(0, tk.END)
@@ -1644,10 +5704,13 @@ class BlenderStyleSearchTool:
         """履歴をクリア"""
         if messagebox.askyesno(self.get_text('warning'), self.get_text('confirm_clear')):
             self.search_history = []
+            self.query_weights = {}
             self.refresh_history()
+            self.rebuild_autocomplete()
             try:
-                if os.path.exists(self.history_file):
-                    os.remove(self.history_file)
+                for path in (self.history_file, self.query_weights_file):
+                    if os.path.exists(path):
+                        os.remove(path)
             except:
                 pass
         
@@ -1662,16 +5725,38 @@ class BlenderStyleSearchTool:
                 self.search_history = []
         except:
             self.search_history = []
+        
+        # 補完用のクエリ重み（無ければ表示用の履歴から作る）
+        try:
+            with open(self.query_weights_file, 'r', encoding='utf-8') as f:
+                self.query_weights = json.load(f)
+        except (OSError, ValueError):
+            self.query_weights = {}
+            for entry in self.search_history:
+                try:
+                    timestamp = datetime.fromisoformat(entry.get('timestamp', '')).timestamp()
+                except (TypeError, ValueError):
+                    timestamp = 0
+                query = entry.get('query', '')
+                self.query_weights[query] = self.query_weights.get(query, 0.0) + recency_weight(timestamp)
+        self.rebuild_autocomplete()
             
         # ブックマーク読み込み
         try:
             if os.path.exists(self.bookmarks_file):
                 with open(self.bookmarks_file, 'r', encoding='utf-8') as f:
-                    self.bookmarks = json.load(f)
+                    self.bookmarks = BookmarkStore(json.load(f))
             else:
-                self.bookmarks = []
+                self.bookmarks = BookmarkStore()
         except:
-            self.bookmarks = []
+            self.bookmarks = BookmarkStore()
+        
+        # 前回のリンク確認結果（一覧の印に使う）
+        try:
+            with open(self.link_check_cache_file, 'r', encoding='utf-8') as f:
+                self.link_status = json.load(f)
+        except (OSError, ValueError):
+            self.link_status = {}
             
     def save_search_history(self, query, result_count):
         """検索履歴保存"""
@@ -1682,13 +5767,18 @@ class BlenderStyleSearchTool:
                 "timestamp": datetime.now().isoformat()
             }
             self.search_history.append(entry)
+            weight = recency_weight()
+            self.query_weights[query] = self.query_weights.get(query, 0.0) + weight
+            self.autocomplete.add(query, weight)
             
-            # 履歴を最新50件に制限
+            # 表示用の履歴は最新50件に制限（補完用の重みはクエリごとに集計して全件残す）
             if len(self.search_history) > 50:
                 self.search_history = self.search_history[-50:]
             
             with open(self.history_file, 'w', encoding='utf-8') as f:
                 json.dump(self.search_history, f, ensure_ascii=False, indent=2)
+            with open(self.query_weights_file, 'w', encoding='utf-8') as f:
+                json.dump(self.query_weights, f, ensure_ascii=False)
         except Exception as e:
             print(f"履歴保存エラー: {e}")
             
@@ -1696,14 +5786,222 @@ class BlenderStyleSearchTool:
         """ブックマーク保存"""
         try:
             with open(self.bookmarks_file, 'w', encoding='utf-8') as f:
-                json.dump(self.bookmarks, f, ensure_ascii=False, indent=2)
+                json.dump(self.bookmarks.to_list(), f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"ブックマーク保存エラー: {e}")
             
+    def load_settings(self):
+        """設定ファイル読み込み"""
+        try:
+            if os.path.exists(self.settings_file):
+                with open(self.settings_file, 'r', encoding='utf-8') as f:
+                    settings = json.load(f)
+                if isinstance(settings, dict):
+                    return settings
+        except Exception as e:
+            print(f"設定読み込みエラー: {e}")
+        return {}
+    
+    def save_settings(self):
+        """設定保存"""
+        try:
+            with open(self.settings_file, 'w', encoding='utf-8') as f:
+                json.dump(self.settings, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"設定保存エラー: {e}")
+            
+    # 常駐サービス
+    def daemon_rescan(self):
+        """常駐サービスでの再スキャン（同時実行しない）"""
+        with self._scan_lock:
+            self.refresh_addon_folders()
+            addons = self.scan_local_addons()
+            self._local_scanned = True
+        return addons
+    
+    def serve(self, host="127.0.0.1", port=DEFAULT_DAEMON_PORT):
+        """インデックスを温めたままHTTP/JSON APIを提供（Ctrl+Cで終了）"""
+        self.daemon_rescan()
+        server = ThreadingHTTPServer((host, port), AddonQueryHandler)
+        server.daemon_threads = True
+        server.app = self
+        print(f"常駐サービス起動: http://{host}:{port} （{len(self.local_addons)}個のアドオン）")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    
+    def connect_daemon(self, base_url):
+        """常駐サービスが動いていれば検索に使う（バックグラウンドで確認）"""
+        def probe():
+            client = DaemonClient(base_url)
+            if client.is_alive():
+                self.daemon_client = client
+                print(f"常駐サービスに接続しました: {base_url}")
+        threading.Thread(target=probe, daemon=True).start()
+            
     def run(self):
         """アプリケーション実行"""
         self.root.mainloop()
+        # 表示中に計算したフォルダサイズも次回に引き継ぐ
+        if self.local_addons:
+            self.save_inventory_cache()
+
+def parse_args(argv=None):
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description="Blender Addon Search Tool")
+    parser.add_argument("--profile", action="store_true",
+                        help="スキャン・検索の各実行をcProfileで計測する")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="プロファイル結果(.prof/.txt)の出力先フォルダ")
+    parser.add_argument("--folder", action="append", metavar="DIR",
+                        help="スキャン対象フォルダ（複数指定可、省略時は自動検出）")
+    parser.add_argument("--export", metavar="PATH",
+                        help="GUIを起動せずインベントリを書き出す（.jsonl / .csv / .parquet）")
+    parser.add_argument("--export-format", choices=EXPORT_FORMATS,
+                        help="書き出し形式（省略時は拡張子から判定）")
+    parser.add_argument("--with-sizes", action="store_true",
+                        help="フォルダ型アドオンの合計サイズも計算する")
+    parser.add_argument("--snapshot", metavar="PATH",
+                        help="GUIを起動せずインベントリのスナップショットを保存する")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"),
+                        help="2つのスナップショットの差分を表示する")
+    parser.add_argument("--serve", action="store_true",
+                        help="常駐サービスとして起動（localhostのHTTP/JSON API）")
+    parser.add_argument("--port", type=int, default=DEFAULT_DAEMON_PORT,
+                        help="常駐サービスのポート番号")
+    parser.add_argument("--query", metavar="TEXT",
+                        help="GUIを起動せず検索して結果を表示（常駐サービスがあれば利用）")
+    parser.add_argument("--build-catalog", nargs='+', metavar="DUMP",
+                        help="エクステンション一覧のJSONダンプからオフライン検索用のカタログ索引を作成する")
+    parser.add_argument("--catalog", metavar="PATH",
+                        help=f"カタログ索引のパス（既定: settings.json の catalog_index または {DEFAULT_CATALOG_INDEX}）")
+    parser.add_argument("--catalog-merge", action="store_true",
+                        help="既存のカタログ索引に追加・上書きする（IDが同じ項目を置き換え）")
+    parser.add_argument("--import-bookmarks", metavar="PATH",
+                        help="ブラウザのブックマークHTMLまたはJSON Linesからブックマークを一括追加する")
+    parser.add_argument("--export-bookmarks", metavar="PATH",
+                        help="ブックマークをHTML（.html）またはJSON Lines（.jsonl）で書き出す")
+    parser.add_argument("--analyze-deps", action="store_true",
+                        help="アドオンのimportを解析し、Blender同梱のPythonに無いモジュールやアドオン間の依存を表示する")
+    parser.add_argument("--compat", metavar="PATH",
+                        help="アドオン × インストール済みBlenderの互換性マトリクスを書き出す（.csv / .jsonl）")
+    parser.add_argument("--target-version", action="append", metavar="X.Y", default=[],
+                        help="互換性マトリクスに加えるBlenderバージョン（導入予定のバージョンなど、複数指定可）")
+    parser.add_argument("--mode", choices=("both", "web", "local"), default="both",
+                        help="--query の検索モード")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """エントリーポイント"""
+    args = parse_args(argv)
+    
+    if args.export:
+        app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir, headless=True)
+        try:
+            count = app.run_profiled(
+                "export", app.export_inventory, args.export, args.export_format, args.folder, args.with_sizes)
+        except (RuntimeError, ValueError) as e:
+            print(f"エクスポートエラー: {e}")
+            sys.exit(1)
+        print(f"{count}件のアドオンを書き出しました: {args.export}")
+        return
+    
+    if args.diff:
+        (old_header, old_records), (new_header, new_records) = map(load_snapshot, args.diff)
+        print(format_snapshot_diff(diff_snapshots(old_records, new_records), *args.diff))
+        return
+    
+    if args.import_bookmarks or args.export_bookmarks:
+        app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir, headless=True)
+        try:
+            if args.import_bookmarks:
+                added, skipped = app.run_profiled("bookmarks", app.import_bookmarks, args.import_bookmarks)
+                print(f"{added}件のブックマークを追加しました（重複 {skipped}件）")
+            if args.export_bookmarks:
+                count = app.export_bookmarks(args.export_bookmarks)
+                print(f"{count}件のブックマークを書き出しました: {args.export_bookmarks}")
+        except (OSError, ValueError) as e:
+            print(f"ブックマークのインポート・エクスポートエラー: {e}")
+            sys.exit(1)
+        return
+    
+    if args.build_catalog:
+        app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir, headless=True)
+        if args.catalog:
+            app.catalog_index = CatalogIndex(args.catalog)
+        try:
+            count = app.run_profiled("catalog", app.build_catalog, args.build_catalog, args.catalog_merge)
+        except (OSError, ValueError) as e:
+            print(f"カタログ索引作成エラー: {e}")
+            sys.exit(1)
+        print(f"{count}件のカタログ索引を作成しました: {app.catalog_index.path}")
+        return
+    
+    daemon_url = f"http://127.0.0.1:{args.port}"
+    
+    if args.serve:
+        app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir, headless=True)
+        if args.folder:
+            app.custom_folders.extend(args.folder)
+        app.serve(port=args.port)
+        return
+    
+    if args.query:
+        app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir, headless=True)
+        if args.folder:
+            app.addon_folders = args.folder
+        # 常駐サービスは対象フォルダが同じときだけ使う（--profile 指定時は自分で計測する）
+        client = DaemonClient(daemon_url)
+        if not args.profile and client.serves_folders(app.addon_folders):
+            results = client.search(args.query, args.mode)
+        else:
+            results = app.run_profiled("search", app.collect_search_results, args.query, args.mode)
+        for result in results:
+            print(f"[{result['type']}] {result['name']}")
+            if result.get('url'):
+                print(f"    {result['url']}")
+        return
+    
+    if args.compat:
+        app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir, headless=True)
+        if args.folder:
+            app.addon_folders = args.folder
+        try:
+            targets = [tuple(int(part) for part in version.split('.')[:2]) for version in args.target_version]
+            count = app.run_profiled("compat", app.export_compat_matrix, args.compat, targets)
+        except (OSError, ValueError) as e:
+            print(f"互換性マトリクス出力エラー: {e}")
+            sys.exit(1)
+        print(app._format_compat_report())
+        print(f"{count}件の互換性マトリクスを書き出しました: {args.compat}")
+        return
+    
+    if args.analyze_deps:
+        app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir, headless=True)
+        if args.folder:
+            app.addon_folders = args.folder
+        graph = app.run_profiled("dependencies", app.analyze_addon_dependencies)
+        print(app._format_dependency_report(graph))
+        return
+    
+    if args.snapshot:
+        app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir, headless=True)
+        if args.folder:
+            app.addon_folders = args.folder
+        count = app.run_profiled("snapshot", app.save_snapshot, args.snapshot)
+        print(f"{count}件のスナップショットを保存しました: {args.snapshot}")
+        return
+    
+    app = BlenderStyleSearchTool(profile=args.profile, profile_dir=args.profile_dir)
+    if args.folder:
+        for folder in args.folder:
+            if folder not in app.addon_folders:
+                app.addon_folders.append(folder)
+    app.connect_daemon(app.settings.get('daemon_url', daemon_url))
+    app.run()
 
 if __name__ == "__main__":
-    app = BlenderStyleSearchTool()
-    app.run()
\ No newline at end of file
+    main()
\ No newline at end of file